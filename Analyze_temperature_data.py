@@ -1,11 +1,21 @@
 import os
-import csv
-import datetime
-from collections import defaultdict
+import time
+import queue
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import subprocess
 
+from temperature_analysis import AnalysisCancelled, PipelineProfile, run_reports, timed
+
+ANALYSIS_WORKERS = None  # Worker processes used to read the CSV files (None = one per CPU core)
+POLL_INTERVAL_MS = 100   # How often the window checks the analysis thread for news
+PROFILE_FILE = None      # Set to a JSON path to record per-stage timings of every analysis
+
+# Messages from the analysis thread to the window, and the flag that cancels it
+analysis_queue = queue.Queue()
+cancel_event = threading.Event()
+
 # === Function to choose a folder ===
 def get_folder_path():
     folder = filedialog.askdirectory(title="Select Folder with CSV Files")
@@ -14,88 +24,6 @@ def get_folder_path():
         exit()
     return folder
 
-# === Function to read and organize temperature data ===
-def read_temperature_data(folder_path):
-    # Define months for each season
-    seasons = {
-        'Summer': ['December', 'January', 'February'],
-        'Autumn': ['March', 'April', 'May'],
-        'Winter': ['June', 'July', 'August'],
-        'Spring': ['September', 'October', 'November']
-    }
-
-    season_temps = defaultdict(list)   # Temperatures by season
-    station_temps = defaultdict(list)  # Temperatures by station
-
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(folder_path, filename)
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    station = row.get("STATION_NAME", "").strip()
-                    for month_num in range(1, 13):
-                        month_name = datetime.datetime(1900, month_num, 1).strftime('%B')
-                        temp = row.get(month_name, "").strip()
-                        try:
-                            temp = float(temp)
-                            station_temps[station].append(temp)
-                            # Add temperature to the correct season
-                            for season, months in seasons.items():
-                                if month_name in months:
-                                    season_temps[season].append(temp)
-                        except:
-                            continue  # If data is missing or wrong, just skip
-    return station_temps, season_temps
-
-# === Task 1: Calculate Average Seasonal Temperatures ===
-def calculate_average_seasonal_temps(season_temps, output_file):
-    with open(output_file, "w") as f:
-        f.write("Average Temperatures by Season (1986–2005):\n")
-        for season in ['Summer', 'Autumn', 'Winter', 'Spring']:
-            temps = season_temps.get(season, [])
-            if temps:
-                avg_temp = sum(temps) / len(temps)
-                f.write(f"{season}: {avg_temp:.2f}°C\n")
-
-# === Task 2: Find Station with Largest Temperature Range ===
-def calculate_largest_temp_range(station_temps, output_file):
-    largest_range = 0
-    stations = []
-
-    for station, temps in station_temps.items():
-        if temps:
-            temp_range = max(temps) - min(temps)
-            if temp_range > largest_range:
-                largest_range = temp_range
-                stations = [station]
-            elif temp_range == largest_range:
-                stations.append(station)
-
-    with open(output_file, "w") as f:
-        f.write(f"Largest Temperature Range: {largest_range:.2f}°C\n")
-        f.write("Station(s):\n")
-        for station in stations:
-            f.write(f"{station}\n")
-
-# === Task 3: Find Warmest and Coolest Stations ===
-def calculate_extreme_stations(station_temps, output_file):
-    averages = {station: sum(temps) / len(temps) for station, temps in station_temps.items() if temps}
-
-    max_avg = max(averages.values())
-    min_avg = min(averages.values())
-
-    warmest_stations = [station for station, avg in averages.items() if avg == max_avg]
-    coolest_stations = [station for station, avg in averages.items() if avg == min_avg]
-
-    with open(output_file, "w") as f:
-        f.write(f"Warmest Station(s) Avg Temp: {max_avg:.2f}°C\n")
-        for station in warmest_stations:
-            f.write(f"{station}\n")
-        f.write(f"\nCoolest Station(s) Avg Temp: {min_avg:.2f}°C\n")
-        for station in coolest_stations:
-            f.write(f"{station}\n")
-
 # === Function to open a file when clicked ===
 def open_file(filepath):
     try:
@@ -106,30 +34,85 @@ def open_file(filepath):
     except Exception as e:
         messagebox.showerror("Error", f"Cannot open file: {e}")
 
-# === Function to run all tasks ===
-def run_analysis():
+# === Function that runs all tasks on a background thread ===
+def analysis_worker(folder_path):
+    # Never touches Tk: everything goes back to the window through analysis_queue
     try:
-        folder_path = get_folder_path()
-        station_temps, season_temps = read_temperature_data(folder_path)
-
-        # Output files
-        avg_file = os.path.join(folder_path, "average_temp.txt")
-        range_file = os.path.join(folder_path, "largest_temp_range_station.txt")
-        extremes_file = os.path.join(folder_path, "warmest_and_coolest_station.txt")
-
-        # Perform calculations
-        calculate_average_seasonal_temps(season_temps, avg_file)
-        calculate_largest_temp_range(station_temps, range_file)
-        calculate_extreme_stations(station_temps, extremes_file)
-
-        # Success message
-        messagebox.showinfo("Done!", "🎉 Reports created successfully!\nClick buttons below to view them.")
-
-        # Show buttons to open created files
-        show_file_buttons([avg_file, range_file, extremes_file])
-
+        profile = PipelineProfile() if PROFILE_FILE else None
+        with timed(profile, "run_analysis"):
+            report_files = run_reports(folder_path, workers=ANALYSIS_WORKERS,
+                                       progress=lambda progress: analysis_queue.put(("progress", progress)),
+                                       cancel=cancel_event, profile=profile)
+        if profile is not None:
+            profile.dump_json(PROFILE_FILE)
+        analysis_queue.put(("done", report_files))
+    except AnalysisCancelled:
+        analysis_queue.put(("cancelled", None))
     except Exception as e:
-        messagebox.showerror("Error", str(e))
+        analysis_queue.put(("error", e))
+
+# === Function to run all tasks ===
+def run_analysis():
+    folder_path = get_folder_path()
+
+    # Clear old results and switch the buttons over to "running"
+    show_file_buttons([])
+    cancel_event.clear()
+    analyze_button.config(state="disabled")
+    cancel_button.config(state="normal")
+    progress_bar["value"] = 0
+    status_label.config(text="Reading CSV files...")
+
+    # Read the data and write the reports next to the CSV files, off the Tk main thread
+    threading.Thread(target=analysis_worker, args=(folder_path,), daemon=True).start()
+    window.after(POLL_INTERVAL_MS, poll_analysis, time.perf_counter())
+
+def cancel_analysis():
+    cancel_event.set()
+    cancel_button.config(state="disabled")
+    status_label.config(text="Cancelling...")
+
+def format_progress(progress, elapsed):
+    rows_per_second = progress.rows / elapsed if elapsed > 0 else 0
+    text = f"File {progress.files_done}/{progress.files_total}  •  {rows_per_second:,.0f} rows/s"
+    if progress.bytes_done:
+        # Estimate the time left from the share of bytes already read
+        remaining = elapsed * (progress.bytes_total - progress.bytes_done) / progress.bytes_done
+        text += f"  •  ETA {remaining:.0f}s"
+    return text
+
+# === Function that checks the analysis thread for news ===
+def poll_analysis(started):
+    while True:
+        try:
+            kind, value = analysis_queue.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "progress":
+            progress_bar["value"] = 100 * value.bytes_done / value.bytes_total if value.bytes_total else 100
+            if not cancel_event.is_set():
+                status_label.config(text=format_progress(value, time.perf_counter() - started))
+            continue
+
+        # The job has finished one way or another
+        analyze_button.config(state="normal")
+        cancel_button.config(state="disabled")
+        if kind == "done":
+            progress_bar["value"] = 100
+            status_label.config(text=f"Finished in {time.perf_counter() - started:.1f}s")
+
+            # Success message
+            messagebox.showinfo("Done!", "🎉 Reports created successfully!\nClick buttons below to view them.")
+
+            # Show buttons to open created files
+            show_file_buttons(value)
+        elif kind == "cancelled":
+            status_label.config(text="Analysis cancelled.")
+        else:
+            status_label.config(text="")
+            messagebox.showerror("Error", str(value))
+        return
+    window.after(POLL_INTERVAL_MS, poll_analysis, started)
 
 # === Function to create file-opening buttons ===
 def show_file_buttons(file_list):
@@ -143,26 +126,36 @@ def show_file_buttons(file_list):
         btn.pack(pady=5)
 
 # === Main GUI Window ===
-window = tk.Tk()
-window.title("🌡️ Temperature Data Analyzer")
-window.geometry("550x450")
-window.configure(bg="lightyellow")
-
-# Heading
-title_label = tk.Label(window, text="Temperature Data Analyzer", font=("Arial", 22, "bold"), bg="lightyellow")
-title_label.pack(pady=20)
-
-# Instructions
-instruction_label = tk.Label(window, text="Click below to select your CSV folder\nand generate temperature reports.", font=("Arial", 14), bg="lightyellow")
-instruction_label.pack(pady=10)
-
-# Analyze Button
-analyze_button = tk.Button(window, text="📂 Select Folder and Start Analysis", font=("Arial", 16), bg="green", fg="white", command=run_analysis)
-analyze_button.pack(pady=20)
-
-# Frame to hold file buttons after analysis
-file_frame = tk.Frame(window, bg="lightyellow")
-file_frame.pack(pady=10)
-
-# Run the app
-window.mainloop()
+# (guarded, because worker processes re-import this file and must not open windows)
+if __name__ == "__main__":
+    window = tk.Tk()
+    window.title("🌡️ Temperature Data Analyzer")
+    window.geometry("550x560")
+    window.configure(bg="lightyellow")
+
+    # Heading
+    title_label = tk.Label(window, text="Temperature Data Analyzer", font=("Arial", 22, "bold"), bg="lightyellow")
+    title_label.pack(pady=20)
+
+    # Instructions
+    instruction_label = tk.Label(window, text="Click below to select your CSV folder\nand generate temperature reports.", font=("Arial", 14), bg="lightyellow")
+    instruction_label.pack(pady=10)
+
+    # Analyze Button
+    analyze_button = tk.Button(window, text="📂 Select Folder and Start Analysis", font=("Arial", 16), bg="green", fg="white", command=run_analysis)
+    analyze_button.pack(pady=20)
+
+    # Progress of a running analysis, and the button to stop it
+    progress_bar = ttk.Progressbar(window, length=400, maximum=100)
+    progress_bar.pack(pady=5)
+    status_label = tk.Label(window, text="", font=("Arial", 12), bg="lightyellow")
+    status_label.pack()
+    cancel_button = tk.Button(window, text="✖ Cancel", font=("Arial", 12), state="disabled", command=cancel_analysis)
+    cancel_button.pack(pady=5)
+
+    # Frame to hold file buttons after analysis
+    file_frame = tk.Frame(window, bg="lightyellow")
+    file_frame.pack(pady=10)
+
+    # Run the app
+    window.mainloop()
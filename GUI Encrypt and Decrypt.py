@@ -1,78 +1,83 @@
 import os
+import time
+import queue
+import threading
+from functools import partial
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 
+from cipher_engine import encrypt_file, decrypt_file, is_compact_metadata, verify_files, verify_digest
+from cipher_batch import encrypt_folder, decrypt_folder, format_summary
+
+POLL_INTERVAL_MS = 100  # How often the window checks the cipher thread for news
+COMPACT_METADATA = True  # Write the binary metadata format (old .txt metadata still decrypts)
+METADATA_EXTENSION = ".bin" if COMPACT_METADATA else ".txt"
+BATCH_WORKERS = None     # Worker processes for the batch actions (None = one per CPU core)
+
+# Messages from the cipher thread to the window
+cipher_queue = queue.Queue()
+
 # --- Logic Functions ---
-def encrypt_text(text, n, m):
-    encrypted_text = ""
-    metadata = ""
-    for char in text:
-        if 'a' <= char <= 'm':
-            shift = (n * m) % 26
-            encrypted_text += chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
-            metadata += "1"
-        elif 'n' <= char <= 'z':
-            shift = (n + m) % 26
-            encrypted_text += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-            metadata += "2"
-        elif 'A' <= char <= 'M':
-            shift = n % 26
-            encrypted_text += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-            metadata += "3"
-        elif 'N' <= char <= 'Z':
-            shift = (m ** 2) % 26
-            encrypted_text += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
-            metadata += "4"
-        else:
-            encrypted_text += char
-            metadata += "0"
-    return encrypted_text, metadata
-
-def decrypt_text(encrypted_text, metadata, n, m):
-    decrypted_text = ""
-    for i, char in enumerate(encrypted_text):
-        category = metadata[i]
-        if category == "1":
-            shift = (n * m) % 26
-            decrypted_text += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-        elif category == "2":
-            shift = (n + m) % 26
-            decrypted_text += chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
-        elif category == "3":
-            shift = n % 26
-            decrypted_text += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
-        elif category == "4":
-            shift = (m ** 2) % 26
-            decrypted_text += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-        else:
-            decrypted_text += char
-    return decrypted_text
+def check_decryption(original_path, decrypted_path, progress=None):
+    # (matched, first Mismatch or None). The "original" can also be a compact metadata
+    # file: then only the decrypted file is read, and hashed against the digest recorded
+    # at encrypt time (a digest only tells whether they match, not where they differ)
+    if is_compact_metadata(original_path):
+        return verify_digest(decrypted_path, original_path, progress), None
+    mismatch = verify_files(original_path, decrypted_path, progress)
+    return mismatch is None, mismatch
 
-def check_decryption(original, decrypted):
-    return original == decrypted
+def verification_report(result):
+    # check_decryption's result -> (dialog title, message, passed)
+    matched, mismatch = result
+    if matched:
+        return "Verification ✅", "Texts Match Successfully!", True
+    if mismatch is None:
+        return "Verification ❌", "Texts Do NOT Match! (the digest in the metadata differs)", False
+    return ("Verification ❌", f"Texts Do NOT Match!\nFirst difference at line {mismatch.line}, "
+                              f"column {mismatch.column} (character {mismatch.offset:,})", False)
 
-def save_file(name, content, folder):
+def free_path(name, folder, extension=".txt"):
+    # name.txt, or name1.txt, name2.txt, ... when it is taken
     counter = 0
     while True:
-        filename = f"{name}.txt" if counter == 0 else f"{name}{counter}.txt"
+        filename = f"{name}{extension}" if counter == 0 else f"{name}{counter}{extension}"
         path = os.path.join(folder, filename)
         if not os.path.exists(path):
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
             return path
         counter += 1
 
+def cipher_worker(job, args, output_paths, message):
+    # Runs on a background thread and never touches Tk: news goes through cipher_queue.
+    # message is the text shown at the end, or a function that makes it from the job's
+    # result: either that text or a whole (dialog title, text, passed) report.
+    try:
+        result = job(*args, progress=lambda done, total: cipher_queue.put(("progress", (done, total))))
+        if callable(message):
+            message = message(result)
+        if isinstance(message, str):
+            message = ("Done ✅", message, True)
+        cipher_queue.put(("done", (message, output_paths)))
+    except Exception as e:
+        cipher_queue.put(("error", e))
+
 def open_file(filepath):
     os.startfile(filepath)
 
 # --- GUI Functions ---
-def browse_file(entry_widget, title):
-    file_path = filedialog.askopenfilename(title=title, filetypes=[("Text Files", "*.txt")])
+def browse_file(entry_widget, title, filetypes=(("Text Files", "*.txt"),)):
+    file_path = filedialog.askopenfilename(title=title, filetypes=list(filetypes))
     if file_path:
         entry_widget.delete(0, tk.END)
         entry_widget.insert(0, file_path)
 
+def browse_folder(entry_widget, title):
+    folder = filedialog.askdirectory(title=title)
+    if folder:
+        entry_widget.delete(0, tk.END)
+        entry_widget.insert(0, folder)
+
 def update_ui(event=None):
     clear_frames()
     view_frame.pack_forget()
@@ -85,6 +90,8 @@ def update_ui(event=None):
         frame_decrypt.pack(pady=20)
     elif selected_action == "Verify ✅":
         frame_verify.pack(pady=20)
+    elif selected_action in ("Batch Encrypt 📁", "Batch Decrypt 📂"):
+        frame_batch.pack(pady=20)
     
     view_frame.pack(pady=15)
     start_frame.pack(pady=20)
@@ -93,6 +100,7 @@ def clear_frames():
     frame_encrypt.pack_forget()
     frame_decrypt.pack_forget()
     frame_verify.pack_forget()
+    frame_batch.pack_forget()
 
 def process_action():
     action = action_var.get()
@@ -112,14 +120,12 @@ def process_action():
         if not os.path.isfile(file_path):
             messagebox.showerror("Error ❌", "Please select a valid text file!")
             return
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-        encrypted_text, metadata = encrypt_text(text, n, m)
         folder = os.path.dirname(file_path)
-        encrypted_path = save_file("encrypted_text", encrypted_text, folder)
-        metadata_path = save_file("encryption_metadata", metadata, folder)
-        messagebox.showinfo("Done ✅", "Encryption Completed!")
-        show_view_buttons([encrypted_path, metadata_path])
+        encrypted_path = free_path("encrypted_text", folder)
+        metadata_path = free_path("encryption_metadata", folder, METADATA_EXTENSION)
+        start_job(partial(encrypt_file, compact=COMPACT_METADATA),
+                  (file_path, encrypted_path, metadata_path, n, m),
+                  [encrypted_path, metadata_path], "Encryption Completed!")
 
     elif action == "Decrypt 🔓":
         encrypted_path = entry_decrypt_text.get().strip()
@@ -127,15 +133,9 @@ def process_action():
         if not os.path.isfile(encrypted_path) or not os.path.isfile(metadata_path):
             messagebox.showerror("Error ❌", "Please select valid files!")
             return
-        with open(encrypted_path, "r", encoding="utf-8") as f:
-            encrypted_text = f.read()
-        with open(metadata_path, "r", encoding="utf-8") as f:
-            metadata = f.read()
-        decrypted_text = decrypt_text(encrypted_text, metadata, n, m)
-        folder = os.path.dirname(encrypted_path)
-        decrypted_path = save_file("decrypted_text", decrypted_text, folder)
-        messagebox.showinfo("Done ✅", "Decryption Completed!")
-        show_view_buttons([decrypted_path])
+        decrypted_path = free_path("decrypted_text", os.path.dirname(encrypted_path))
+        start_job(decrypt_file, (encrypted_path, metadata_path, decrypted_path, n, m),
+                  [decrypted_path], "Decryption Completed!")
 
     elif action == "Verify ✅":
         original_path = entry_verify_original.get().strip()
@@ -143,14 +143,60 @@ def process_action():
         if not os.path.isfile(original_path) or not os.path.isfile(decrypted_path):
             messagebox.showerror("Error ❌", "Please select valid files!")
             return
-        with open(original_path, "r", encoding="utf-8") as f:
-            original_text = f.read()
-        with open(decrypted_path, "r", encoding="utf-8") as f:
-            decrypted_text = f.read()
-        if check_decryption(original_text, decrypted_text):
-            messagebox.showinfo("Verification ✅", "Texts Match Successfully!")
+        start_job(check_decryption, (original_path, decrypted_path), [], verification_report)
+
+    elif action in ("Batch Encrypt 📁", "Batch Decrypt 📂"):
+        source_folder = entry_batch_source.get().strip()
+        output_folder = entry_batch_output.get().strip()
+        if not os.path.isdir(source_folder) or not output_folder:
+            messagebox.showerror("Error ❌", "Please select a source folder and an output folder!")
+            return
+        if action == "Batch Encrypt 📁":
+            job = partial(encrypt_folder, compact=COMPACT_METADATA)
         else:
-            messagebox.showerror("Verification ❌", "Texts Do NOT Match!")
+            job = decrypt_folder
+        start_job(job, (source_folder, output_folder, n, m, BATCH_WORKERS), [output_folder], format_summary)
+
+def start_job(job, args, output_paths, message):
+    # Stream the files on a background thread so big files keep the window responsive
+    for widget in view_frame.winfo_children():
+        widget.destroy()
+    start_button.config(state="disabled")
+    progress_bar["value"] = 0
+    status_label.config(text="Working...")
+    threading.Thread(target=cipher_worker, args=(job, args, output_paths, message), daemon=True).start()
+    root.after(POLL_INTERVAL_MS, poll_job, time.perf_counter())
+
+def poll_job(started):
+    while True:
+        try:
+            kind, value = cipher_queue.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "progress":
+            done, total = value
+            progress_bar["value"] = 100 * done / total if total else 100
+            elapsed = time.perf_counter() - started
+            status_label.config(text=f"{done / 2 ** 20:,.1f} / {total / 2 ** 20:,.1f} MB  •  "
+                                     f"{done / 2 ** 20 / elapsed if elapsed > 0 else 0:,.1f} MB/s")
+            continue
+
+        # The job has finished one way or another
+        start_button.config(state="normal")
+        if kind == "done":
+            (title, message, passed), output_paths = value
+            progress_bar["value"] = 100
+            status_label.config(text=f"Finished in {time.perf_counter() - started:.1f}s")
+            if passed:
+                messagebox.showinfo(title, message)
+                show_view_buttons(output_paths)
+            else:
+                messagebox.showerror(title, message)
+        else:
+            status_label.config(text="")
+            messagebox.showerror("Error ❌", str(value))
+        return
+    root.after(POLL_INTERVAL_MS, poll_job, started)
 
 def show_view_buttons(filepaths):
     for widget in view_frame.winfo_children():
@@ -163,65 +209,84 @@ def show_view_buttons(filepaths):
     start_frame.pack(pady=20)
 
 # --- GUI Setup ---
-root = tk.Tk()
-root.title("Encryptor & Decryptor App 🔐")
-root.geometry("650x750")  # 🔥 made window smaller
-root.configure(bg="#e0f2fe")
-
-# Title
-tk.Label(root, text="Encryptor & Decryptor 🔒", font=("Helvetica", 28, "bold"), bg="#e0f2fe").pack(pady=20)
-
-# Action Dropdown
-action_var = tk.StringVar(value="Select Action")  # 🔥 default text
-action_menu = ttk.Combobox(root, textvariable=action_var, font=("Helvetica", 22), state="readonly",
-                           values=["Encrypt 🔒", "Decrypt 🔓", "Verify ✅"], width=20, justify="center")
-action_menu.pack(pady=20)
-action_menu.bind("<<ComboboxSelected>>", update_ui)
-
-# N and M Inputs
-frame_nm = tk.Frame(root, bg="#e0f2fe")
-frame_nm.pack(pady=15)
-entry_n = tk.Entry(frame_nm, font=("Helvetica", 18), width=10, justify="center")
-entry_n.grid(row=0, column=0, padx=10)
-entry_n.insert(0, "n")
-entry_m = tk.Entry(frame_nm, font=("Helvetica", 18), width=10, justify="center")
-entry_m.grid(row=0, column=1, padx=10)
-entry_m.insert(0, "m")
-
-# Frames for each action
-frame_encrypt = tk.Frame(root, bg="#e0f2fe")
-entry_encrypt_file = tk.Entry(frame_encrypt, width=40, font=("Helvetica", 16), justify="center")
-entry_encrypt_file.pack(pady=5)
-tk.Button(frame_encrypt, text="📄 Browse Text File", font=("Helvetica", 14),
-          command=lambda: browse_file(entry_encrypt_file, "Select Text File")).pack(pady=5)
-
-frame_decrypt = tk.Frame(root, bg="#e0f2fe")
-entry_decrypt_text = tk.Entry(frame_decrypt, width=40, font=("Helvetica", 16), justify="center")
-entry_decrypt_text.pack(pady=5)
-tk.Button(frame_decrypt, text="📄 Browse Encrypted File", font=("Helvetica", 14),
-          command=lambda: browse_file(entry_decrypt_text, "Select Encrypted File")).pack(pady=5)
-entry_decrypt_metadata = tk.Entry(frame_decrypt, width=40, font=("Helvetica", 16), justify="center")
-entry_decrypt_metadata.pack(pady=5)
-tk.Button(frame_decrypt, text="📜 Browse Metadata File", font=("Helvetica", 14),
-          command=lambda: browse_file(entry_decrypt_metadata, "Select Metadata File")).pack(pady=5)
-
-frame_verify = tk.Frame(root, bg="#e0f2fe")
-entry_verify_original = tk.Entry(frame_verify, width=40, font=("Helvetica", 16), justify="center")
-entry_verify_original.pack(pady=5)
-tk.Button(frame_verify, text="📄 Browse Original Text", font=("Helvetica", 14),
-          command=lambda: browse_file(entry_verify_original, "Select Original File")).pack(pady=5)
-entry_verify_decrypted = tk.Entry(frame_verify, width=40, font=("Helvetica", 16), justify="center")
-entry_verify_decrypted.pack(pady=5)
-tk.Button(frame_verify, text="📜 Browse Decrypted Text", font=("Helvetica", 14),
-          command=lambda: browse_file(entry_verify_decrypted, "Select Decrypted File")).pack(pady=5)
-
-# View Buttons Frame
-view_frame = tk.Frame(root, bg="#e0f2fe")
-
-# Start Button Frame
-start_frame = tk.Frame(root, bg="#e0f2fe")
-start_button = tk.Button(start_frame, text="🚀 Start", font=("Helvetica", 20, "bold"), bg="#2563eb", fg="white",
-                         command=process_action)
-start_button.pack(pady=10)
-
-root.mainloop()
+# (guarded, because the batch worker processes re-import this file and must not open windows)
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Encryptor & Decryptor App 🔐")
+    root.geometry("650x750")  # 🔥 made window smaller
+    root.configure(bg="#e0f2fe")
+
+    # Title
+    tk.Label(root, text="Encryptor & Decryptor 🔒", font=("Helvetica", 28, "bold"), bg="#e0f2fe").pack(pady=20)
+
+    # Action Dropdown
+    action_var = tk.StringVar(value="Select Action")  # 🔥 default text
+    action_menu = ttk.Combobox(root, textvariable=action_var, font=("Helvetica", 22), state="readonly",
+                               values=["Encrypt 🔒", "Decrypt 🔓", "Verify ✅", "Batch Encrypt 📁", "Batch Decrypt 📂"],
+                               width=20, justify="center")
+    action_menu.pack(pady=20)
+    action_menu.bind("<<ComboboxSelected>>", update_ui)
+
+    # N and M Inputs
+    frame_nm = tk.Frame(root, bg="#e0f2fe")
+    frame_nm.pack(pady=15)
+    entry_n = tk.Entry(frame_nm, font=("Helvetica", 18), width=10, justify="center")
+    entry_n.grid(row=0, column=0, padx=10)
+    entry_n.insert(0, "n")
+    entry_m = tk.Entry(frame_nm, font=("Helvetica", 18), width=10, justify="center")
+    entry_m.grid(row=0, column=1, padx=10)
+    entry_m.insert(0, "m")
+
+    # Frames for each action
+    frame_encrypt = tk.Frame(root, bg="#e0f2fe")
+    entry_encrypt_file = tk.Entry(frame_encrypt, width=40, font=("Helvetica", 16), justify="center")
+    entry_encrypt_file.pack(pady=5)
+    tk.Button(frame_encrypt, text="📄 Browse Text File", font=("Helvetica", 14),
+              command=lambda: browse_file(entry_encrypt_file, "Select Text File")).pack(pady=5)
+
+    frame_decrypt = tk.Frame(root, bg="#e0f2fe")
+    entry_decrypt_text = tk.Entry(frame_decrypt, width=40, font=("Helvetica", 16), justify="center")
+    entry_decrypt_text.pack(pady=5)
+    tk.Button(frame_decrypt, text="📄 Browse Encrypted File", font=("Helvetica", 14),
+              command=lambda: browse_file(entry_decrypt_text, "Select Encrypted File")).pack(pady=5)
+    entry_decrypt_metadata = tk.Entry(frame_decrypt, width=40, font=("Helvetica", 16), justify="center")
+    entry_decrypt_metadata.pack(pady=5)
+    tk.Button(frame_decrypt, text="📜 Browse Metadata File", font=("Helvetica", 14),
+              command=lambda: browse_file(entry_decrypt_metadata, "Select Metadata File",
+                                            (("Metadata Files", "*.bin *.txt"), ("All Files", "*.*")))).pack(pady=5)
+
+    frame_verify = tk.Frame(root, bg="#e0f2fe")
+    entry_verify_original = tk.Entry(frame_verify, width=40, font=("Helvetica", 16), justify="center")
+    entry_verify_original.pack(pady=5)
+    tk.Button(frame_verify, text="📄 Browse Original Text or Metadata", font=("Helvetica", 14),
+              command=lambda: browse_file(entry_verify_original, "Select Original File",
+                                          (("Text or Metadata Files", "*.txt *.bin"), ("All Files", "*.*")))).pack(pady=5)
+    entry_verify_decrypted = tk.Entry(frame_verify, width=40, font=("Helvetica", 16), justify="center")
+    entry_verify_decrypted.pack(pady=5)
+    tk.Button(frame_verify, text="📜 Browse Decrypted Text", font=("Helvetica", 14),
+              command=lambda: browse_file(entry_verify_decrypted, "Select Decrypted File")).pack(pady=5)
+
+    frame_batch = tk.Frame(root, bg="#e0f2fe")
+    entry_batch_source = tk.Entry(frame_batch, width=40, font=("Helvetica", 16), justify="center")
+    entry_batch_source.pack(pady=5)
+    tk.Button(frame_batch, text="📁 Browse Source Folder", font=("Helvetica", 14),
+              command=lambda: browse_folder(entry_batch_source, "Select Source Folder")).pack(pady=5)
+    entry_batch_output = tk.Entry(frame_batch, width=40, font=("Helvetica", 16), justify="center")
+    entry_batch_output.pack(pady=5)
+    tk.Button(frame_batch, text="📂 Browse Output Folder", font=("Helvetica", 14),
+              command=lambda: browse_folder(entry_batch_output, "Select Output Folder")).pack(pady=5)
+
+    # View Buttons Frame
+    view_frame = tk.Frame(root, bg="#e0f2fe")
+
+    # Start Button Frame
+    start_frame = tk.Frame(root, bg="#e0f2fe")
+    start_button = tk.Button(start_frame, text="🚀 Start", font=("Helvetica", 20, "bold"), bg="#2563eb", fg="white",
+                             command=process_action)
+    start_button.pack(pady=10)
+    progress_bar = ttk.Progressbar(start_frame, length=400, mode="determinate", maximum=100)
+    progress_bar.pack(pady=5)
+    status_label = tk.Label(start_frame, text="", font=("Helvetica", 12), bg="#e0f2fe")
+    status_label.pack()
+
+    root.mainloop()
@@ -1,7 +1,10 @@
+import time
 import turtle
 import tkinter as tk
 from tkinter import messagebox
 
+from tree_geometry import PALETTE, DEFAULT_WIDTH, DEFAULT_HEIGHT, TreeParams, iter_levels, start_point
+
 # Function to draw the tree recursively
 def draw_tree(t, branch_length, left_angle, right_angle, depth, reduction_factor, is_stem=True):
     if depth == 0:
@@ -41,8 +44,76 @@ def draw_tree(t, branch_length, left_angle, right_angle, depth, reduction_factor
     t.setheading(current_heading)
     t.pendown()
 
+# --- Fast interactive drawing ---
+# The tree is drawn into a canvas of its own next to the input window, so new values
+# can be tried without restarting. Segments come precomputed from tree_geometry one
+# level at a time (one colour and width each, so the pen is set once per level), the
+# tracer is off, and the screen is updated after every level or FRAME_BUDGET_MS of drawing.
+FRAME_BUDGET_MS = 30
+
+tree_window = None
+tree_screen = None
+tree_turtle = None
+draw_job = None
+
+def open_tree_window():
+    global tree_window, tree_screen, tree_turtle
+    if tree_window is None:
+        tree_window = tk.Toplevel(window)
+        tree_window.title("🌳 Your Recursive Tree")
+        tree_window.protocol("WM_DELETE_WINDOW", close_tree_window)
+        canvas = tk.Canvas(tree_window, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, bg="white")
+        canvas.pack()
+        tree_screen = turtle.TurtleScreen(canvas)
+        tree_screen.bgcolor("white")
+        tree_screen.tracer(0)
+        tree_turtle = turtle.RawTurtle(tree_screen)
+        tree_turtle.hideturtle()
+    tree_window.deiconify()
+    tree_window.lift()
+
+def close_tree_window():
+    global tree_window, tree_screen, tree_turtle
+    cancel_drawing()
+    tree_window.destroy()
+    tree_window = tree_screen = tree_turtle = None
+
+def cancel_drawing():
+    global draw_job
+    if draw_job is not None:
+        window.after_cancel(draw_job)
+        draw_job = None
+
+def draw_levels(t, levels):
+    # Draws one segment per step; yields True when a level is finished
+    for level in levels:
+        t.pencolor(PALETTE[level.color])
+        t.pensize(level.width)
+        for x0, y0, x1, y1 in zip(level.x0, level.y0, level.x1, level.y1):
+            t.penup()
+            t.goto(x0, y0)
+            t.pendown()
+            t.goto(x1, y1)
+            yield False
+        yield True
+
+def draw_frame(steps, started, count=0):
+    # Draw until a level ends or the frame budget runs out, show it, and come back for more
+    global draw_job
+    deadline = time.perf_counter() + FRAME_BUDGET_MS / 1000
+    for level_done in steps:
+        count += not level_done  # Branches drawn so far
+        if level_done or time.perf_counter() >= deadline:
+            tree_screen.update()
+            draw_job = window.after(1, draw_frame, steps, started, count)
+            return
+    tree_screen.update()
+    draw_job = None
+    error_label.config(text=f"{count:,} branches in {time.perf_counter() - started:.2f}s", fg="black")
+
 # Function that starts the drawing when button clicked
 def start_drawing():
+    global draw_job
     try:
         # Get user inputs
         left_angle = float(left_angle_entry.get())
@@ -50,28 +121,15 @@ def start_drawing():
         start_length = float(start_length_entry.get())
         max_depth = int(max_depth_entry.get())
         reduction_factor = float(reduction_factor_entry.get())
+        params = TreeParams(left_angle, right_angle, start_length, max_depth, reduction_factor)
 
-        # Close GUI window
-        window.destroy()
-
-        # Setup Turtle window
-        screen = turtle.Screen()
-        screen.bgcolor("white")
-        screen.title("🌳 Your Recursive Tree")
-
-        t = turtle.Turtle()
-        t.speed(0)
-        t.left(90)  # Point turtle upwards
-        t.penup()
-        t.goto(0, -screen.window_height() // 2 + 50)
-        t.pendown()
-
-        turtle.tracer(1, 20)  # Add slight delay for animation effect
-
-        draw_tree(t, start_length, left_angle, right_angle, max_depth, reduction_factor)
-
-        t.hideturtle()
-        turtle.done()
+        # Clear the tree window (opening it if needed) and start drawing in frames
+        cancel_drawing()
+        open_tree_window()
+        tree_turtle.clear()
+        error_label.config(text="Drawing...", fg="black")
+        steps = draw_levels(tree_turtle, iter_levels(params, start_point(DEFAULT_HEIGHT)))
+        draw_job = window.after(1, draw_frame, steps, time.perf_counter())
 
     except Exception as e:
         error_label.config(text=f"Error: {e}", fg="red")
@@ -88,54 +146,55 @@ def show_info(parameter):
     messagebox.showinfo("Info", messages.get(parameter, "No info available."))
 
 # --- GUI Setup ---
-
-# Create main window
-window = tk.Tk()
-window.title("🌳 Easy Recursive Tree Generator")
-window.geometry("600x700")
-window.configure(bg="lightblue")
-
-# Title label
-title_label = tk.Label(window, text="Enter Values Below", font=("Arial", 20, "bold"), bg="lightblue")
-title_label.pack(pady=20)
-
-# Frame to hold all input fields
-input_frame = tk.Frame(window, bg="lightblue")
-input_frame.pack()
-
-# Function to create label, entry box and info button
-def create_input_row(label_text, variable_name):
-    frame = tk.Frame(input_frame, bg="lightblue")
-    frame.pack(pady=10, padx=20, fill="x")
-
-    # Label + Info Button
-    label_frame = tk.Frame(frame, bg="lightblue")
-    label_frame.pack(anchor="w")
-    label = tk.Label(label_frame, text=label_text, font=("Arial", 14), bg="lightblue")
-    label.pack(side="left")
-    info_button = tk.Button(label_frame, text="i", command=lambda: show_info(variable_name), bg="white", fg="blue", font=("Arial", 12, "bold"), width=2)
-    info_button.pack(side="left", padx=5)
-
-    # Entry Box
-    entry = tk.Entry(frame, font=("Arial", 14))
-    entry.pack(fill="x", pady=5)
-
-    return entry
-
-# Create input fields
-left_angle_entry = create_input_row("Left Branch Angle (e.g., 20°):", "left_angle")
-right_angle_entry = create_input_row("Right Branch Angle (e.g., 25°):", "right_angle")
-start_length_entry = create_input_row("Starting Branch Length (e.g., 100):", "start_length")
-max_depth_entry = create_input_row("Recursion Depth (e.g., 5):", "max_depth")
-reduction_factor_entry = create_input_row("Reduction Factor (e.g., 0.7):", "reduction_factor")
-
-# Create Tree Button
-create_tree_button = tk.Button(window, text="🌳 Create Tree 🌳", command=start_drawing, bg="green", fg="white", font=("Arial", 16, "bold"), width=20)
-create_tree_button.pack(pady=40)
-
-# Error label
-error_label = tk.Label(window, text="", font=("Arial", 12), bg="lightblue")
-error_label.pack()
-
-# Start the GUI loop
-window.mainloop()
+# (guarded, so other scripts can import draw_tree without opening the window)
+if __name__ == "__main__":
+    # Create main window
+    window = tk.Tk()
+    window.title("🌳 Easy Recursive Tree Generator")
+    window.geometry("600x700")
+    window.configure(bg="lightblue")
+
+    # Title label
+    title_label = tk.Label(window, text="Enter Values Below", font=("Arial", 20, "bold"), bg="lightblue")
+    title_label.pack(pady=20)
+
+    # Frame to hold all input fields
+    input_frame = tk.Frame(window, bg="lightblue")
+    input_frame.pack()
+
+    # Function to create label, entry box and info button
+    def create_input_row(label_text, variable_name):
+        frame = tk.Frame(input_frame, bg="lightblue")
+        frame.pack(pady=10, padx=20, fill="x")
+
+        # Label + Info Button
+        label_frame = tk.Frame(frame, bg="lightblue")
+        label_frame.pack(anchor="w")
+        label = tk.Label(label_frame, text=label_text, font=("Arial", 14), bg="lightblue")
+        label.pack(side="left")
+        info_button = tk.Button(label_frame, text="i", command=lambda: show_info(variable_name), bg="white", fg="blue", font=("Arial", 12, "bold"), width=2)
+        info_button.pack(side="left", padx=5)
+
+        # Entry Box
+        entry = tk.Entry(frame, font=("Arial", 14))
+        entry.pack(fill="x", pady=5)
+
+        return entry
+
+    # Create input fields
+    left_angle_entry = create_input_row("Left Branch Angle (e.g., 20°):", "left_angle")
+    right_angle_entry = create_input_row("Right Branch Angle (e.g., 25°):", "right_angle")
+    start_length_entry = create_input_row("Starting Branch Length (e.g., 100):", "start_length")
+    max_depth_entry = create_input_row("Recursion Depth (e.g., 5):", "max_depth")
+    reduction_factor_entry = create_input_row("Reduction Factor (e.g., 0.7):", "reduction_factor")
+
+    # Create Tree Button
+    create_tree_button = tk.Button(window, text="🌳 Create Tree 🌳", command=start_drawing, bg="green", fg="white", font=("Arial", 16, "bold"), width=20)
+    create_tree_button.pack(pady=40)
+
+    # Error label
+    error_label = tk.Label(window, text="", font=("Arial", 12), bg="lightblue")
+    error_label.pack()
+
+    # Start the GUI loop
+    window.mainloop()
@@ -0,0 +1,113 @@
+import sys
+import time
+import random
+import argparse
+
+from cipher_engine import encrypt_text, decrypt_text, key_shifts
+from cipher_keys import recover_keys
+
+WORDS = ("the quick brown fox jumps over a lazy dog While Sydney and Melbourne argue about "
+         "coffee, Perth quietly Enjoys the Sunshine. Zebra Xylophone Quartz yield Nothing!").split()
+
+# --- Original per-character functions, kept here as the baseline ---
+def legacy_encrypt_text(text, n, m):
+    encrypted_text = ""
+    metadata = ""
+    for char in text:
+        if 'a' <= char <= 'm':
+            shift = (n * m) % 26
+            encrypted_text += chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
+            metadata += "1"
+        elif 'n' <= char <= 'z':
+            shift = (n + m) % 26
+            encrypted_text += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
+            metadata += "2"
+        elif 'A' <= char <= 'M':
+            shift = n % 26
+            encrypted_text += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
+            metadata += "3"
+        elif 'N' <= char <= 'Z':
+            shift = (m ** 2) % 26
+            encrypted_text += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
+            metadata += "4"
+        else:
+            encrypted_text += char
+            metadata += "0"
+    return encrypted_text, metadata
+
+def legacy_decrypt_text(encrypted_text, metadata, n, m):
+    decrypted_text = ""
+    for i, char in enumerate(encrypted_text):
+        category = metadata[i]
+        if category == "1":
+            shift = (n * m) % 26
+            decrypted_text += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
+        elif category == "2":
+            shift = (n + m) % 26
+            decrypted_text += chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
+        elif category == "3":
+            shift = n % 26
+            decrypted_text += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
+        elif category == "4":
+            shift = (m ** 2) % 26
+            decrypted_text += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
+        else:
+            decrypted_text += char
+    return decrypted_text
+
+# --- Benchmark ---
+def make_text(size, seed=0):
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+def best_time(func, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the table-driven cipher with the original loops.")
+    parser.add_argument("--size-mb", type=float, default=2.0, help="size of the generated text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-n", type=int, default=7)
+    parser.add_argument("-m", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    text = make_text(int(args.size_mb * 1_000_000))
+    mb = len(text.encode("utf-8")) / 1_000_000
+    n, m = args.n, args.m
+
+    legacy_encrypt, (encrypted, metadata) = best_time(lambda: legacy_encrypt_text(text, n, m), args.repeat)
+    engine_encrypt, result = best_time(lambda: encrypt_text(text, n, m), args.repeat)
+    if result != (encrypted, metadata):
+        raise AssertionError("encrypt_text output differs from the original")
+
+    legacy_decrypt, decrypted = best_time(lambda: legacy_decrypt_text(encrypted, metadata, n, m), args.repeat)
+    engine_decrypt, result = best_time(lambda: decrypt_text(encrypted, metadata, n, m), args.repeat)
+    if result != decrypted or decrypted != text:
+        raise AssertionError("decrypt_text output differs from the original")
+
+    print(f"{mb:.1f} MB of text, best of {args.repeat}")
+    for name, legacy, engine in (("encrypt", legacy_encrypt, engine_encrypt), ("decrypt", legacy_decrypt, engine_decrypt)):
+        print(f"{name}: original {mb / legacy:8.1f} MB/s   table-driven {mb / engine:8.1f} MB/s   "
+              f"x{legacy / engine:.0f}")
+
+    # Key recovery: where the real key ranks among all 676 classes, by frequency alone and with a crib
+    for label, crib in (("frequency", None), ("crib", text[:32])):
+        elapsed, candidates = best_time(lambda: recover_keys(encrypted, metadata, crib, top=None), args.repeat)
+        rank = [candidate.shifts for candidate in candidates].index(key_shifts(n, m)) + 1
+        print(f"recover ({label}): {elapsed * 1000:6.1f} ms   real key ranked {rank} of {len(candidates)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+from temperature_analysis import (MONTHS, read_temperature_data, summarize_table, stream_temperature_stats,
+                                  calculate_average_seasonal_temps, calculate_largest_temp_range,
+                                  calculate_extreme_stations)
+
+BENCHMARK_VERSION = 1
+GARBAGE_CELLS = ["n/a", "-", "ERR", "?", "#VALUE!"]
+
+# === Write a folder of synthetic stations_group_YEAR.csv files ===
+def generate_station_files(folder_path, stations, years, bad_rate=0.0, seed=0):
+    # Same schema as the real files; bad_rate of the month cells are left empty or filled with junk
+    rng = random.Random(seed)
+    first_year = 2000 if years <= 26 else 1900
+    locations = [(f"{rng.uniform(-44, -10):.2f}", f"{rng.uniform(113, 154):.2f}") for _ in range(stations)]
+    for year in range(first_year, first_year + years):
+        file_path = os.path.join(folder_path, f"stations_group_{year}.csv")
+        with open(file_path, "w", encoding="utf-8", newline="") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["STATION_NAME", "STN_ID", "LAT", "LON"] + MONTHS)
+            for station_id, (lat, lon) in enumerate(locations):
+                temps = []
+                for _ in MONTHS:
+                    if rng.random() < bad_rate:
+                        temps.append("" if rng.random() < 0.5 else rng.choice(GARBAGE_CELLS))
+                    else:
+                        temps.append(f"{rng.uniform(-5, 40):.2f}")
+                writer.writerow([f"STATION-{station_id}", station_id, lat, lon] + temps)
+
+# === Measure one stage ===
+def measure(stage, func, rows, track_memory=True):
+    start = time.perf_counter()
+    result = func()
+    wall = time.perf_counter() - start
+
+    peak_mb = None
+    if track_memory:
+        # Separate run: tracemalloc slows Python down too much to time the same call
+        tracemalloc.start()
+        func()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    record = {"stage": stage, "wall_s": wall, "peak_mb": peak_mb,
+              "rows_per_s": rows / wall if wall > 0 else None}
+    memory = f"{peak_mb:9.1f} MB" if peak_mb is not None else ""
+    print(f"{stage:<36} {wall:9.3f}s {rows / wall if wall > 0 else 0:14,.0f} rows/s {memory}".rstrip())
+    return result, record
+
+def run_suite(folder_path, rows, output_dir, track_memory=True):
+    records = []
+    table, record = measure("read_temperature_data", lambda: read_temperature_data(folder_path, use_store=False),
+                            rows, track_memory)
+    records.append(record)
+    stats, record = measure("summarize_table", lambda: summarize_table(table), rows, track_memory)
+    records.append(record)
+    del table
+    _, record = measure("stream_temperature_stats", lambda: stream_temperature_stats(folder_path), rows, track_memory)
+    records.append(record)
+
+    for report, name in ((calculate_average_seasonal_temps, "average_temp.txt"),
+                         (calculate_largest_temp_range, "largest_temp_range_station.txt"),
+                         (calculate_extreme_stations, "warmest_and_coolest_station.txt")):
+        output_file = os.path.join(output_dir, name)
+        _, record = measure(report.__name__, lambda: report(stats, output_file), rows, track_memory)
+        records.append(record)
+    return records
+
+# === Time the ingestion for each worker count ===
+def benchmark_workers(folder_path, worker_counts):
+    results = []
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        stats = stream_temperature_stats(folder_path, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        # Every worker count must reproduce the serial result exactly
+        summary = ({station: (s.count, s.total, s.low, s.high) for station, s in stats.stations.items()},
+                   {season: (s.count, s.total, s.low, s.high) for season, s in stats.seasons.items()})
+        if baseline is None:
+            baseline = summary
+        elif summary != baseline:
+            raise AssertionError(f"{workers} workers gave a different result than 1 worker")
+
+        speedup = (results[0]["wall_s"] if results else elapsed) / elapsed
+        results.append({"workers": workers, "wall_s": elapsed, "speedup": speedup})
+        print(f"workers={workers:<3} {elapsed:8.3f}s  speedup x{speedup:.2f}")
+    return results
+
+# === Compare against an earlier results file ===
+def compare_results(records, previous_path, tolerance):
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = {record["stage"]: record for record in json.load(f)["results"]}
+    regressions = []
+    for record in records:
+        before = previous.get(record["stage"])
+        if before and before["wall_s"]:
+            ratio = record["wall_s"] / before["wall_s"]
+            flag = "  <-- slower" if ratio > 1 + tolerance else ""
+            print(f"{record['stage']:<36} x{ratio:.2f} vs previous{flag}")
+            if flag:
+                regressions.append(record["stage"])
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the temperature analyzer on synthetic station CSVs.")
+    parser.add_argument("--stations", type=int, default=2000, help="stations per file (100 to 1,000,000)")
+    parser.add_argument("--years", type=int, default=32, help="number of stations_group_YEAR.csv files (1 to 200)")
+    parser.add_argument("--bad-rate", type=float, default=0.02, help="fraction of month cells left empty or invalid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory runs")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="earlier JSON results to compare wall times against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="slowdown allowed by --compare")
+    parser.add_argument("--workers-scaling", action="store_true", help="also time parallel ingestion")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    rows = args.stations * args.years
+    results = {"version": BENCHMARK_VERSION, "python": platform.python_version(), "platform": platform.platform(),
+               "params": {"stations": args.stations, "years": args.years, "bad_rate": args.bad_rate,
+                          "seed": args.seed, "rows": rows}}
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        start = time.perf_counter()
+        generate_station_files(folder_path, args.stations, args.years, args.bad_rate, args.seed)
+        print(f"{args.years} files x {args.stations} stations ({rows:,} rows) "
+              f"generated in {time.perf_counter() - start:.1f}s")
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            results["results"] = run_suite(folder_path, rows, output_dir, not args.no_memory)
+
+        if args.workers_scaling:
+            worker_counts = sorted({1, *(2 ** i for i in range(args.max_workers.bit_length())), args.max_workers})
+            results["workers"] = benchmark_workers(folder_path, [w for w in worker_counts if w <= args.max_workers])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare and compare_results(results["results"], args.compare, args.tolerance):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import os
+import sys
+import math
+import time
+import argparse
+import tempfile
+
+from Recursive_tree import draw_tree
+from tree_geometry import TreeParams, generate_tree, iter_levels, start_point
+from tree_render import render_tree
+
+class RecordingTurtle:
+    # Just enough of turtle.Turtle for draw_tree, keeping the segments instead of drawing
+    # them, so the recursion itself is timed without a window
+    def __init__(self, x, y):
+        self.x, self.y, self.angle, self.pen_down = x, y, 90.0, True
+        self.color, self.width, self.segments = None, 1, 0
+
+    def pencolor(self, color):
+        self.color = color
+
+    def pensize(self, width):
+        self.width = width
+
+    def forward(self, distance):
+        radians = math.radians(self.angle)
+        self.x += distance * math.cos(radians)
+        self.y += distance * math.sin(radians)
+        self.segments += self.pen_down
+
+    def left(self, angle):
+        self.angle += angle
+
+    def right(self, angle):
+        self.angle -= angle
+
+    def pos(self):
+        return self.x, self.y
+
+    def heading(self):
+        return self.angle
+
+    def setpos(self, position):
+        self.x, self.y = position
+
+    def setheading(self, angle):
+        self.angle = angle
+
+    def penup(self):
+        self.pen_down = False
+
+    def pendown(self):
+        self.pen_down = True
+
+def recursive_segments(params):
+    t = RecordingTurtle(*start_point())
+    left_angle, right_angle, start_length, max_depth, reduction_factor = params
+    draw_tree(t, start_length, left_angle, right_angle, max_depth, reduction_factor)
+    return t.segments
+
+def time_it(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def report(name, elapsed, segments):
+    print(f"{name:<40} {segments:>12,} segments {elapsed:8.3f}s {segments / elapsed if elapsed > 0 else 0:14,.0f} seg/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare recursive, stack and level-by-level tree generation.")
+    parser.add_argument("--depth", type=int, default=16, help="depth for the full-tree comparison")
+    parser.add_argument("--deep", type=int, default=25, help="depth for the culled level-by-level run")
+    parser.add_argument("--left", type=float, default=20.0)
+    parser.add_argument("--right", type=float, default=25.0)
+    parser.add_argument("--length", type=float, default=100.0)
+    parser.add_argument("--reduction", type=float, default=0.7)
+    args = parser.parse_args(argv)
+
+    params = TreeParams(args.left, args.right, args.length, args.depth, args.reduction)
+    print(f"Every branch, depth {args.depth}:")
+    report("draw_tree recursion (no window)", *time_it(lambda: recursive_segments(params)))
+    report("generate_tree (explicit stack)", *time_it(lambda: len(generate_tree(params).x0)))
+    report("iter_levels (no culling)", *time_it(
+        lambda: sum(len(level.x0) for level in iter_levels(params, min_length=0, merge_grid=0))))
+
+    deep = params._replace(max_depth=args.deep)
+    print(f"\nDepth {args.deep} with sub-pixel culling:")
+    report("iter_levels", *time_it(lambda: sum(len(level.x0) for level in iter_levels(deep))))
+    with tempfile.TemporaryDirectory() as output_dir:
+        report("render_tree -> PNG", *time_it(lambda: render_tree(deep, os.path.join(output_dir, "tree.png"))))
+        report("render_tree -> SVG", *time_it(lambda: render_tree(deep, os.path.join(output_dir, "tree.svg"))))
+        report("render_tree -> instanced SVG", *time_it(
+            lambda: render_tree(deep, os.path.join(output_dir, "instanced.svg"), instanced=True)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cipher_engine import encrypt_file, decrypt_file, remove_files, is_compact_metadata
+
+# A batch folder mirrors the source tree twice: ENCRYPTED_DIR/<path> holds the
+# encrypted file and METADATA_DIR/<path> its metadata, so every output name is
+# unique by construction and nothing has to probe for a free one
+ENCRYPTED_DIR = "encrypted"
+METADATA_DIR = "metadata"
+COMPACT_EXTENSION = ".bin"  # Added to the name of binary metadata, as for single files
+
+BatchSummary = namedtuple("BatchSummary", ["files", "bytes", "elapsed", "failed"])  # failed: [(path, error)]
+
+def is_batch_folder(folder):
+    return os.path.isdir(os.path.join(folder, ENCRYPTED_DIR)) and os.path.isdir(os.path.join(folder, METADATA_DIR))
+
+def walk_files(folder, skip=None):
+    # Every file under folder in a stable order, leaving out the tree at skip and any
+    # batch folder (from an earlier run with another output folder) inside it
+    skip = os.path.abspath(skip) if skip else None
+    found = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames[:] = sorted(name for name in dirnames
+                             if os.path.abspath(os.path.join(dirpath, name)) != skip
+                             and not is_batch_folder(os.path.join(dirpath, name)))
+        found.extend(os.path.join(dirpath, name) for name in sorted(filenames))
+    return found
+
+def create_exclusive(paths):
+    # Claim every output path with exclusive create, so a batch never overwrites an
+    # existing file; paths already claimed are released again if one is taken
+    created = []
+    try:
+        for path in paths:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            open(path, "x").close()
+            created.append(path)
+    except OSError:
+        remove_files(created)
+        raise
+
+# --- Jobs run in the worker processes (module-level so they can be pickled) ---
+def encrypt_job(text_path, encrypted_path, metadata_path, n, m, compact):
+    create_exclusive([encrypted_path, metadata_path])
+    encrypt_file(text_path, encrypted_path, metadata_path, n, m, compact=compact)
+
+def decrypt_job(encrypted_path, metadata_path, decrypted_path, n, m):
+    create_exclusive([decrypted_path])
+    decrypt_file(encrypted_path, metadata_path, decrypted_path, n, m)
+
+def run_jobs(jobs, workers=None, progress=None):
+    # jobs: [(function, args)] where args[0] is the input file. They run across a
+    # process pool, biggest input first so a large file does not finish last on its own.
+    # progress(bytes_done, bytes_total) is called after each file.
+    start = time.perf_counter()
+    sizes = [os.path.getsize(args[0]) for _, args in jobs]
+    order = sorted(range(len(jobs)), key=lambda i: sizes[i], reverse=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    failed = []
+    bytes_done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(jobs[i][0], *jobs[i][1]): i for i in order}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed.append((jobs[i][1][0], str(e)))
+            bytes_done += sizes[i]
+            if progress is not None:
+                progress(bytes_done, sum(sizes))
+    failed.sort()
+    failed_paths = {path for path, _ in failed}
+    done_bytes = sum(size for (_, args), size in zip(jobs, sizes) if args[0] not in failed_paths)
+    return BatchSummary(len(jobs) - len(failed), done_bytes, time.perf_counter() - start, failed)
+
+# --- Whole-folder encryption / decryption ---
+def encrypt_folder(source_dir, batch_dir, n, m, workers=None, progress=None, compact=True):
+    # Every file under source_dir -> batch_dir/encrypted/<path> + batch_dir/metadata/<path>[.bin]
+    if is_batch_folder(source_dir):
+        raise ValueError(f"{source_dir} is a batch folder; decrypt it instead of encrypting it again")
+    jobs = []
+    for text_path in walk_files(source_dir, skip=batch_dir):
+        relative = os.path.relpath(text_path, source_dir)
+        metadata_path = os.path.join(batch_dir, METADATA_DIR, relative) + (COMPACT_EXTENSION if compact else "")
+        jobs.append((encrypt_job, (text_path, os.path.join(batch_dir, ENCRYPTED_DIR, relative), metadata_path,
+                                   n, m, compact)))
+    return run_jobs(jobs, workers, progress)
+
+def batch_metadata_path(batch_dir, relative):
+    # Binary metadata is <path>.bin; checking its header keeps a digit metadata file that
+    # happens to end in .bin (of a source file named that way) from being taken for it
+    compact_path = os.path.join(batch_dir, METADATA_DIR, relative) + COMPACT_EXTENSION
+    if os.path.isfile(compact_path) and is_compact_metadata(compact_path):
+        return compact_path
+    return os.path.join(batch_dir, METADATA_DIR, relative)
+
+def decrypt_folder(batch_dir, output_dir, n, m, workers=None, progress=None):
+    # A batch folder written by encrypt_folder -> the original tree under output_dir
+    encrypted_dir = os.path.join(batch_dir, ENCRYPTED_DIR)
+    jobs = []
+    for encrypted_path in walk_files(encrypted_dir, skip=output_dir):
+        relative = os.path.relpath(encrypted_path, encrypted_dir)
+        jobs.append((decrypt_job, (encrypted_path, batch_metadata_path(batch_dir, relative),
+                                   os.path.join(output_dir, relative), n, m)))
+    return run_jobs(jobs, workers, progress)
+
+def format_summary(summary):
+    megabytes = summary.bytes / 2 ** 20
+    text = (f"{summary.files} file(s), {megabytes:,.1f} MB in {summary.elapsed:.2f}s "
+            f"({megabytes / summary.elapsed if summary.elapsed > 0 else 0:,.1f} MB/s)")
+    if summary.failed:
+        text += f", {len(summary.failed)} failed:\n" + "\n".join(f"  {path}: {error}" for path, error in summary.failed)
+    return text
+
+# === Command-line batch mode ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt every file in a folder tree in parallel.")
+    parser.add_argument("action", choices=["encrypt", "decrypt"])
+    parser.add_argument("source", help="folder to encrypt, or a batch folder to decrypt")
+    parser.add_argument("output", help="batch folder to write, or folder for the decrypted tree")
+    parser.add_argument("-n", type=int, required=True)
+    parser.add_argument("-m", type=int, required=True)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--text-metadata", action="store_true", help="write digit metadata instead of binary")
+    args = parser.parse_args(argv)
+
+    if args.action == "encrypt":
+        summary = encrypt_folder(args.source, args.output, args.n, args.m, args.workers,
+                                 compact=not args.text_metadata)
+    else:
+        summary = decrypt_folder(args.source, args.output, args.n, args.m, args.workers)
+    print(format_summary(summary))
+    return 1 if summary.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+import os
+import struct
+import hashlib
+from collections import namedtuple
+from functools import lru_cache
+
+CHUNK_CHARS = 1 << 20  # Characters per chunk in the file functions; memory stays a small multiple of this
+
+# Compact metadata file: header, then one bit per character (see pack_metadata).
+# Version 2 adds the SHA-256 of the plain text, so a decrypted file can be verified without the original.
+METADATA_MAGIC = b"CIPHMETA"
+METADATA_VERSION = 2
+METADATA_HEADERS = {1: struct.Struct("<8sIQ"),      # magic, version, characters
+                    2: struct.Struct("<8sIQ32s")}  # ..., SHA-256 of the text as UTF-8
+METADATA_HEADER = METADATA_HEADERS[METADATA_VERSION]
+VERIFY_CHUNK_BYTES = 1 << 20  # Bytes per read in the byte-for-byte verification pass
+
+# --- Character categories ---
+# Every character gets one metadata digit:
+#   "1" a-m (shifted forward by (n * m) % 26)    "2" n-z (shifted back by (n + m) % 26)
+#   "3" A-M (shifted back by n % 26)             "4" N-Z (shifted forward by (m ** 2) % 26)
+#   "0" anything else (left unchanged)
+LOWER = "abcdefghijklmnopqrstuvwxyz"
+UPPER = LOWER.upper()
+CATEGORY_LETTERS = {"1": LOWER[:13], "2": LOWER[13:], "3": UPPER[:13], "4": UPPER[13:]}
+
+# Both directions work on bytes, so one bytes.translate call handles a whole buffer:
+# encryption on the UTF-8 encoding (where every byte below 0x80 is an ASCII character),
+# decryption on the low byte of each UTF-32 lane. Decryption needs the category as well
+# as the character, so every category "2" / "4" letter gets FLAG added to its byte first.
+FLAG = 0x80
+CONTINUATION_BYTES = bytes(range(0x80, 0xC0))  # UTF-8 bytes that do not start a character
+
+def byte_table(mapping, default=None):
+    # 256-byte bytes.translate table: mapping {byte: byte}, others map to default (None = itself)
+    return bytes(mapping.get(byte, byte if default is None else default) for byte in range(256))
+
+# Byte of a character -> its metadata digit (continuation bytes are deleted separately)
+METADATA_BYTES = byte_table({ord(char): ord(category) for category, letters in CATEGORY_LETTERS.items()
+                             for char in letters}, ord("0"))
+# Byte of a character / metadata digit -> "l" (lowercase), "u" (uppercase) or "0" (other)
+CHAR_CLASS_BYTES = byte_table({ord(char): ord("l") for char in LOWER} | {ord(char): ord("u") for char in UPPER},
+                              ord("0"))
+CATEGORY_CLASS_BYTES = byte_table({ord("1"): ord("l"), ord("2"): ord("l"), ord("3"): ord("u"), ord("4"): ord("u")},
+                                  ord("0"))
+# Metadata digit -> byte added to the character (FLAG_BYTES) / 0xFF where the character is kept (KEEP_BYTES)
+FLAG_BYTES = byte_table({ord("2"): FLAG, ord("4"): FLAG}, 0)
+KEEP_BYTES = byte_table({ord(category): 0 for category in CATEGORY_LETTERS}, 0xFF)
+
+# Compact metadata only stores whether a letter is in the second half of its alphabet
+# ("2" / "4"); the case of the encrypted letter gives the rest back
+HALF_BIT_BYTES = byte_table({ord("2"): ord("1"), ord("4"): ord("1")}, ord("0"))
+BIT_FLAG_BYTES = byte_table({ord("1"): FLAG}, 0)
+LETTER_BYTES = byte_table({ord(char): 1 for char in LOWER} | {ord(char): 3 for char in UPPER}, 0)
+DIGIT_BYTES = byte_table({1: ord("1"), 1 | FLAG: ord("2"), 3: ord("3"), 3 | FLAG: ord("4")}, ord("0"))
+
+def key_shifts(n, m):
+    # The four shifts a key (n, m) boils down to, in category order 1-4
+    return (n * m) % 26, (n + m) % 26, n % 26, (m ** 2) % 26
+
+def shift_letters(letters, alphabet, shift):
+    return {ord(char): ord(alphabet[(alphabet.index(char) + shift) % 26]) for char in letters}
+
+@lru_cache(maxsize=256)
+def cipher_tables(shifts):
+    # bytes.translate tables for one set of shifts, built once and reused for every buffer
+    s1, s2, s3, s4 = shifts
+    encrypt = {}
+    decrypt = {code | FLAG: code for code in range(FLAG)}  # A FLAG on anything but a letter is ignored
+    for category, alphabet, shift in (("1", LOWER, s1), ("2", LOWER, -s2), ("3", UPPER, -s3), ("4", UPPER, s4)):
+        encrypt.update(shift_letters(CATEGORY_LETTERS[category], alphabet, shift))
+        # Decryption looks at the encrypted letter, which can be anywhere in the alphabet
+        flag = FLAG if category in "24" else 0
+        decrypt.update({code + flag: char for code, char in shift_letters(alphabet, alphabet, -shift).items()})
+    return byte_table(encrypt), byte_table(decrypt)
+
+def int_bytes(data):
+    return int.from_bytes(data, "little")
+
+# --- Logic Functions ---
+def encrypt_text(text, n, m):
+    encrypt, _ = cipher_tables(key_shifts(n, m))
+    data = text.encode("utf-8", "surrogatepass")
+    metadata = data.translate(METADATA_BYTES, CONTINUATION_BYTES)  # One digit per character
+    return data.translate(encrypt).decode("utf-8", "surrogatepass"), metadata.decode("ascii")
+
+def pack_metadata(metadata):
+    # Metadata digits -> one bit per character, 8 characters per byte, first character in the top bit
+    size = (len(metadata) + 7) // 8
+    if not size:
+        return b""
+    bits = metadata.encode("ascii").translate(HALF_BIT_BYTES).ljust(size * 8, b"0")
+    return int(bits, 2).to_bytes(size, "big")
+
+def unpack_flags(packed, count):
+    # FLAG (second half) or 0 for each of the first count characters
+    if len(packed) * 8 < count:
+        raise IndexError("metadata is shorter than the encrypted text")
+    if not count:
+        return b""
+    bits = format(int.from_bytes(packed, "big"), f"0{len(packed) * 8}b")[:count]
+    return bits.encode("ascii").translate(BIT_FLAG_BYTES)
+
+def unpack_categories(encrypted_text, packed):
+    # Metadata digits (as bytes) of encrypted_text rebuilt from its packed bits
+    count = len(encrypted_text)
+    flags = unpack_flags(packed, count)
+    letters = encrypted_text.encode("utf-8", "surrogatepass").translate(LETTER_BYTES, CONTINUATION_BYTES)
+    return (int_bytes(letters) | int_bytes(flags)).to_bytes(count, "little").translate(DIGIT_BYTES)
+
+def decrypt_text(encrypted_text, metadata, n, m):
+    # metadata is either the digit string from encrypt_text or pack_metadata bytes
+    if isinstance(metadata, (bytes, bytearray)):
+        # Packed metadata agrees with the encrypted text by construction
+        if not encrypted_text.isascii():
+            return decrypt_categories(encrypted_text, unpack_categories(encrypted_text, metadata), n, m)
+        # ASCII text: the packed bits are the FLAGs themselves
+        count = len(encrypted_text)
+        flags = unpack_flags(metadata, count)
+        _, decrypt = cipher_tables(key_shifts(n, m))
+        flagged = int_bytes(encrypted_text.encode("ascii")) | int_bytes(flags)
+        return flagged.to_bytes(count, "little").translate(decrypt).decode("ascii")
+    if len(metadata) < len(encrypted_text):
+        raise IndexError("metadata is shorter than the encrypted text")
+    metadata = metadata[:len(encrypted_text)]
+
+    # Metadata written by encrypt_text always agrees with the case of each encrypted
+    # character; anything else (hand-edited or mismatched files) takes the slow path
+    if not metadata.isascii():
+        return decrypt_chars(encrypted_text, metadata, n, m)
+    categories = metadata.encode("ascii")
+    char_classes = encrypted_text.encode("utf-8", "surrogatepass").translate(CHAR_CLASS_BYTES, CONTINUATION_BYTES)
+    if char_classes != categories.translate(CATEGORY_CLASS_BYTES):
+        return decrypt_chars(encrypted_text, metadata, n, m)
+    return decrypt_categories(encrypted_text, categories, n, m)
+
+def decrypt_categories(encrypted_text, categories, n, m):
+    # categories: one ASCII metadata digit per character, known to match the encrypted text
+    _, decrypt = cipher_tables(key_shifts(n, m))
+    if encrypted_text.isascii():
+        data = encrypted_text.encode("ascii")
+        flagged = (int_bytes(data) | int_bytes(categories.translate(FLAG_BYTES))).to_bytes(len(data), "little")
+        return flagged.translate(decrypt).decode("ascii")
+
+    # Other text: decrypt the low byte of every UTF-32 lane, then put back the low
+    # bytes of the characters that are not letters (category "0")
+    lanes = bytearray(encrypted_text.encode("utf-32-le", "surrogatepass"))
+    low = lanes[0::4]
+    flagged = (int_bytes(low) | int_bytes(categories.translate(FLAG_BYTES))).to_bytes(len(low), "little")
+    keep = int_bytes(categories.translate(KEEP_BYTES))
+    merged = (int_bytes(flagged.translate(decrypt)) & ~keep) | (int_bytes(low) & keep)
+    lanes[0::4] = merged.to_bytes(len(low), "little")
+    return lanes.decode("utf-32-le", "surrogatepass")
+
+def decrypt_chars(encrypted_text, metadata, n, m):
+    # Character-by-character decryption that follows the metadata even where it
+    # does not match the encrypted text
+    shift1, shift2, shift3, shift4 = key_shifts(n, m)
+    decrypted = []
+    for char, category in zip(encrypted_text, metadata):
+        if category == "1":
+            decrypted.append(chr((ord(char) - ord('a') - shift1) % 26 + ord('a')))
+        elif category == "2":
+            decrypted.append(chr((ord(char) - ord('a') + shift2) % 26 + ord('a')))
+        elif category == "3":
+            decrypted.append(chr((ord(char) - ord('A') + shift3) % 26 + ord('A')))
+        elif category == "4":
+            decrypted.append(chr((ord(char) - ord('A') - shift4) % 26 + ord('A')))
+        else:
+            decrypted.append(char)
+    return "".join(decrypted)
+
+# --- Streaming file functions ---
+# Files are read in text mode one chunk at a time, so the output is the same as
+# f.read() + encrypt_text / decrypt_text while memory stays bounded at any file size.
+# progress(bytes_done, bytes_total) is called after every chunk.
+def report_progress(progress, f, total):
+    if progress is not None:
+        progress(min(f.buffer.tell(), total), total)
+
+def remove_files(paths):
+    # Drop half-written output after a failure
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def is_compact_metadata(metadata_path):
+    with open(metadata_path, "rb") as f:
+        return f.read(len(METADATA_MAGIC)) == METADATA_MAGIC
+
+def encrypt_file(text_path, encrypted_path, metadata_path, n, m, progress=None, chunk_chars=CHUNK_CHARS,
+                 compact=False):
+    # compact=True writes the binary metadata format instead of one digit per character
+    total = os.path.getsize(text_path)
+    chunk_chars = -(-chunk_chars // 8) * 8  # Whole bytes of packed metadata per chunk
+    try:
+        with open(text_path, "r", encoding="utf-8") as text_file, \
+                open(encrypted_path, "w", encoding="utf-8") as encrypted_file, \
+                open(metadata_path, "wb" if compact else "w", **({} if compact else {"encoding": "utf-8"})) \
+                as metadata_file:
+            if compact:
+                metadata_file.write(METADATA_HEADER.pack(METADATA_MAGIC, METADATA_VERSION, 0, bytes(32)))
+                digest = hashlib.sha256()
+            count = 0
+            while chunk := text_file.read(chunk_chars):
+                encrypted_text, metadata = encrypt_text(chunk, n, m)
+                encrypted_file.write(encrypted_text)
+                if compact:
+                    metadata_file.write(pack_metadata(metadata))
+                    digest.update(chunk.encode("utf-8"))
+                else:
+                    metadata_file.write(metadata)
+                count += len(chunk)
+                report_progress(progress, text_file, total)
+            if compact:
+                # The character count and digest are only known at the end
+                metadata_file.seek(0)
+                metadata_file.write(METADATA_HEADER.pack(METADATA_MAGIC, METADATA_VERSION, count, digest.digest()))
+    except BaseException:
+        remove_files([encrypted_path, metadata_path])
+        raise
+
+def read_metadata_header(metadata_file, metadata_path):
+    # (characters, SHA-256 digest or None) from the start of a compact metadata file
+    start = metadata_file.read(METADATA_HEADERS[1].size)
+    version = struct.unpack_from("<I", start, len(METADATA_MAGIC))[0] if len(start) == METADATA_HEADERS[1].size else 0
+    if version not in METADATA_HEADERS:
+        raise ValueError(f"{metadata_path} was written by an incompatible version")
+    header = start + metadata_file.read(METADATA_HEADERS[version].size - len(start))
+    if len(header) < METADATA_HEADERS[version].size:
+        raise ValueError(f"{metadata_path} is truncated")
+    _, _, characters, *digest = METADATA_HEADERS[version].unpack(header)
+    return characters, digest[0] if digest and any(digest[0]) else None
+
+def open_metadata(metadata_path):
+    # (file, characters): legacy digit files open in text mode with characters None,
+    # compact ones in binary mode just after their header
+    if not is_compact_metadata(metadata_path):
+        return open(metadata_path, "r", encoding="utf-8"), None
+    metadata_file = open(metadata_path, "rb")
+    try:
+        characters, _ = read_metadata_header(metadata_file, metadata_path)
+    except BaseException:
+        metadata_file.close()
+        raise
+    return metadata_file, characters
+
+def recorded_digest(metadata_path):
+    # SHA-256 of the plain text stored at encrypt time, or None (digit or version 1 metadata)
+    if not is_compact_metadata(metadata_path):
+        return None
+    with open(metadata_path, "rb") as metadata_file:
+        return read_metadata_header(metadata_file, metadata_path)[1]
+
+def decrypt_file(encrypted_path, metadata_path, decrypted_path, n, m, progress=None, chunk_chars=CHUNK_CHARS):
+    # The metadata is read in lockstep: one digit (or packed bit) per encrypted character
+    total = os.path.getsize(encrypted_path)
+    chunk_chars = -(-chunk_chars // 8) * 8
+    metadata_file, remaining = open_metadata(metadata_path)
+    try:
+        with metadata_file, open(encrypted_path, "r", encoding="utf-8") as encrypted_file, \
+                open(decrypted_path, "w", encoding="utf-8") as decrypted_file:
+            while chunk := encrypted_file.read(chunk_chars):
+                if remaining is None:
+                    metadata = metadata_file.read(len(chunk))
+                elif len(chunk) > remaining:
+                    raise IndexError("metadata is shorter than the encrypted text")
+                else:
+                    metadata = metadata_file.read(-(-len(chunk) // 8))
+                    remaining -= len(chunk)
+                decrypted_file.write(decrypt_text(chunk, metadata, n, m))
+                report_progress(progress, encrypted_file, total)
+    except BaseException:
+        remove_files([decrypted_path])
+        raise
+
+# --- Verification ---
+# Texts are compared the way they are read everywhere else: as text with universal
+# newlines, so a decrypted copy with different line endings still matches
+Mismatch = namedtuple("Mismatch", ["offset", "line", "column"])  # Character offset, 1-based line and column
+
+def same_bytes(path_a, path_b, progress=None):
+    # Cheap checks first: different sizes can still be the same text, so they only skip this pass
+    total = os.path.getsize(path_a)
+    if total != os.path.getsize(path_b):
+        return False
+    done = 0
+    with open(path_a, "rb") as file_a, open(path_b, "rb") as file_b:
+        while chunk := file_a.read(VERIFY_CHUNK_BYTES):
+            if chunk != file_b.read(len(chunk)):
+                return False
+            done += len(chunk)
+            if progress is not None:
+                progress(done, total)
+    return True
+
+def first_difference(a, b):
+    # Index of the first character where a and b differ (binary search over slice compares)
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def verify_files(original_path, decrypted_path, progress=None, chunk_chars=CHUNK_CHARS):
+    # None when the texts match, else the Mismatch where they first differ. Stops at the first difference.
+    if same_bytes(original_path, decrypted_path, progress):
+        return None
+
+    total = os.path.getsize(original_path)
+    offset = line = 0
+    line_start = 0  # Offset of the first character of the current line
+    with open(original_path, "r", encoding="utf-8") as original_file, \
+            open(decrypted_path, "r", encoding="utf-8") as decrypted_file:
+        while True:
+            original = original_file.read(chunk_chars)
+            decrypted = decrypted_file.read(chunk_chars)
+            if original != decrypted:
+                index = first_difference(original, decrypted)
+                line += original.count("\n", 0, index)
+                last_newline = original.rfind("\n", 0, index)
+                if last_newline >= 0:
+                    line_start = offset + last_newline + 1
+                return Mismatch(offset + index, line + 1, offset + index - line_start + 1)
+            if not original:
+                return None
+            line += original.count("\n")
+            last_newline = original.rfind("\n")
+            if last_newline >= 0:
+                line_start = offset + last_newline + 1
+            offset += len(original)
+            report_progress(progress, original_file, total)
+
+def text_digest(text_path, progress=None, chunk_chars=CHUNK_CHARS):
+    # SHA-256 of a text file as encrypt_file records it
+    total = os.path.getsize(text_path)
+    digest = hashlib.sha256()
+    with open(text_path, "r", encoding="utf-8") as text_file:
+        while chunk := text_file.read(chunk_chars):
+            digest.update(chunk.encode("utf-8"))
+            report_progress(progress, text_file, total)
+    return digest.digest()
+
+def verify_digest(decrypted_path, metadata_path, progress=None):
+    # One hashing pass over the decrypted file against the digest in its metadata; no original needed
+    expected = recorded_digest(metadata_path)
+    if expected is None:
+        raise ValueError(f"{metadata_path} has no recorded digest")
+    return text_digest(decrypted_path, progress) == expected
@@ -0,0 +1,130 @@
+import sys
+import math
+import argparse
+from functools import lru_cache
+from collections import namedtuple, defaultdict
+
+from cipher_engine import (LOWER, UPPER, FLAG, CONTINUATION_BYTES, FLAG_BYTES, byte_table, key_shifts, int_bytes,
+                           unpack_categories, open_metadata)
+
+SAMPLE_CHARS = 1 << 14  # Characters scored; letter statistics have long settled by then
+
+# English letter frequencies (%), a-z
+ENGLISH_FREQUENCIES = [8.17, 1.49, 2.78, 4.25, 12.70, 2.23, 2.02, 6.09, 6.97, 0.15, 0.77, 4.03, 2.41,
+                       6.75, 7.51, 1.93, 0.10, 5.99, 6.33, 9.06, 2.76, 0.98, 2.36, 0.15, 1.97, 0.07]
+IMPOSSIBLE_LOG = math.log(1e-9)  # Log-probability of a letter its category can never decrypt to
+
+# Per category: the alphabet, the plain-text letters it covers and the sign of the
+# decryption shift (encryption moves categories 1 and 4 forward, 2 and 3 back)
+CATEGORIES = [(LOWER, LOWER[:13], -1, 0), (LOWER, LOWER[13:], 1, FLAG),
+              (UPPER, UPPER[:13], 1, 0), (UPPER, UPPER[13:], -1, FLAG)]
+
+# One byte per character: ASCII stays itself, any other character becomes 0
+CHAR_BYTES = byte_table({byte: 0 for byte in range(0xC0, 0x100)})
+
+Candidate = namedtuple("Candidate", ["score", "crib_matches", "shifts", "keys"])  # keys: [(n, m)] with 0 <= n, m < 26
+
+@lru_cache(maxsize=None)
+def key_classes():
+    # Every key (n, m) collapses to its four shifts, which only depend on n % 26 and m % 26
+    classes = defaultdict(list)
+    for n in range(26):
+        for m in range(26):
+            classes[key_shifts(n, m)].append((n, m))
+    return dict(classes)
+
+def flagged_sample(encrypted_text, metadata, start=0, count=SAMPLE_CHARS):
+    # One byte per character of [start, start + count) with FLAG set on category 2 / 4
+    # letters, so a byte value names both the encrypted letter and its category
+    aligned = start - start % 8  # Packed metadata holds 8 characters per byte
+    encrypted_text = encrypted_text[aligned:start + count]
+    if isinstance(metadata, (bytes, bytearray)):
+        categories = unpack_categories(encrypted_text, metadata[aligned // 8:(start + count + 7) // 8])
+    else:
+        if len(metadata) < aligned + len(encrypted_text):
+            raise IndexError("metadata is shorter than the encrypted text")
+        categories = metadata[aligned:aligned + len(encrypted_text)].encode("ascii", "replace")
+    data = encrypted_text.encode("utf-8", "surrogatepass").translate(CHAR_BYTES, CONTINUATION_BYTES)
+    flagged = (int_bytes(data) | int_bytes(categories.translate(FLAG_BYTES))).to_bytes(len(data), "little")
+    return flagged[start - aligned:]
+
+def shift_scores(flagged):
+    # scores[category][shift]: log-likelihood of the category's letters decrypted with that shift
+    log_frequency = [math.log(frequency / 100) for frequency in ENGLISH_FREQUENCIES]
+    scores = []
+    for alphabet, plain_letters, sign, flag in CATEGORIES:
+        counts = [flagged.count(ord(char) | flag) for char in alphabet]
+        allowed = [alphabet[i] in plain_letters for i in range(26)]
+        category_scores = []
+        for shift in range(26):
+            score = 0.0
+            for index, count in enumerate(counts):
+                if count:
+                    plain = (index + sign * shift) % 26
+                    score += count * (log_frequency[plain] if allowed[plain] else IMPOSSIBLE_LOG)
+            category_scores.append(score)
+        scores.append(category_scores)
+    return scores
+
+def crib_votes(flagged, crib, offset=0):
+    # votes[category][shift]: crib letters that decrypt correctly with that shift
+    votes = [[0] * 26 for _ in CATEGORIES]
+    for byte, plain in zip(flagged[offset:offset + len(crib)], crib):
+        for category, (alphabet, plain_letters, sign, flag) in enumerate(CATEGORIES):
+            if plain in plain_letters and chr(byte & ~FLAG) in alphabet and byte & FLAG == flag:
+                cipher = alphabet.index(chr(byte & ~FLAG))
+                votes[category][(alphabet.index(plain) - cipher) * sign % 26] += 1
+    return votes
+
+def recover_keys(encrypted_text, metadata, crib=None, crib_offset=0, top=10):
+    # Ranked candidates, best first. With a crib (known plain text at crib_offset), keys
+    # that decrypt more of it win; English letter frequencies order the rest.
+    # encrypted_text (and metadata) must reach past the end of the crib.
+    flagged = flagged_sample(encrypted_text, metadata)
+    scores = shift_scores(flagged)
+    votes = None
+    if crib:
+        if crib_offset < 0 or crib_offset + len(crib) > len(encrypted_text):
+            raise ValueError(f"the crib at {crib_offset:,}-{crib_offset + len(crib):,} lies outside "
+                             f"the {len(encrypted_text):,} characters given")
+        votes = crib_votes(flagged_sample(encrypted_text, metadata, crib_offset, len(crib)), crib)
+
+    candidates = []
+    for shifts, keys in key_classes().items():
+        score = sum(scores[category][shift] for category, shift in enumerate(shifts))
+        matches = sum(votes[category][shift] for category, shift in enumerate(shifts)) if votes else None
+        candidates.append(Candidate(score, matches, shifts, keys))
+    candidates.sort(key=lambda candidate: (-(candidate.crib_matches or 0), -candidate.score))
+    return candidates[:top]
+
+def read_sample(encrypted_path, metadata_path, end=0):
+    # The first SAMPLE_CHARS characters of an encrypted file, or the first end if that is
+    # further (to reach a crib), and the matching metadata
+    count = max(SAMPLE_CHARS, end)
+    with open(encrypted_path, "r", encoding="utf-8") as encrypted_file:
+        encrypted_text = encrypted_file.read(count)
+    metadata_file, characters = open_metadata(metadata_path)
+    with metadata_file:
+        metadata = metadata_file.read(count if characters is None else (count + 7) // 8)
+    return encrypted_text, metadata
+
+# === Command-line key recovery ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank the keys (n, m) that could have produced an encrypted file.")
+    parser.add_argument("encrypted", help="encrypted text file")
+    parser.add_argument("metadata", help="its metadata file (digit or compact)")
+    parser.add_argument("--crib", help="known plain text at the start of the file (or at --crib-offset)")
+    parser.add_argument("--crib-offset", type=int, default=0, help="character offset of the crib")
+    parser.add_argument("--top", type=int, default=5, help="number of candidates to list")
+    args = parser.parse_args(argv)
+
+    encrypted_text, metadata = read_sample(args.encrypted, args.metadata,
+                                           args.crib_offset + len(args.crib) if args.crib else 0)
+    for rank, candidate in enumerate(recover_keys(encrypted_text, metadata, args.crib, args.crib_offset, args.top), 1):
+        keys = ", ".join(f"({n}, {m})" for n, m in candidate.keys)
+        crib = f"  crib {candidate.crib_matches}/{sum(char in LOWER + UPPER for char in args.crib)} letters" if args.crib else ""
+        print(f"{rank}. shifts {candidate.shifts}  score {candidate.score:,.0f}{crib}  keys mod 26: {keys}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,760 @@
+import os
+import sys
+import csv
+import json
+import math
+import mmap
+import time
+import struct
+import hashlib
+import argparse
+from array import array
+from collections import namedtuple
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as ResultTimeout
+from contextlib import contextmanager, nullcontext
+from itertools import filterfalse, islice
+
+try:
+    import resource  # Peak memory for profiles; not available on Windows
+except ImportError:
+    resource = None
+
+# Month columns in the order they appear in every stations_group_*.csv file
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+
+# Define months for each season
+SEASONS = {
+    'Summer': ['December', 'January', 'February'],
+    'Autumn': ['March', 'April', 'May'],
+    'Winter': ['June', 'July', 'August'],
+    'Spring': ['September', 'October', 'November']
+}
+
+# Month column positions (0-11) belonging to each season
+# (sorted, so season readings are visited in the same month order as the CSV)
+SEASON_COLUMNS = {season: sorted(MONTHS.index(month) for month in months) for season, months in SEASONS.items()}
+
+MISSING = math.nan  # Marker for missing or unreadable readings
+
+# Per-file aggregates are cached next to the data so unchanged files are not parsed again:
+# one JSON file per CSV in CACHE_DIRNAME, named "<csv name>.<size>.<mtime_ns>.<sha256>.json",
+# so a run only reads and writes the entries of files that changed
+CACHE_DIRNAME = ".temperature_cache"
+CACHE_VERSION = 2
+
+# Binary station store written by convert_to_store() and memory-mapped by open_station_store()
+STORE_FILENAME = ".station_store.bin"
+STORE_MAGIC = b"STNSTORE"
+STORE_VERSION = 1
+# magic, version, little-endian flag, stations, rows, sources, metadata bytes
+STORE_HEADER = struct.Struct("<8sIIQQQQ")
+
+# Columnar station data: one row of 12 monthly readings per station per file.
+#   stations      - station names, position = station id
+#   station_index - station name -> station id
+#   stn_ids       - STN_ID of every station (as text)
+#   lats, lons    - LAT / LON of every station, NaN = missing
+#   sources       - CSV file names, position = source id
+#   row_source    - source id of every row
+#   row_station   - station id of every row
+#   readings      - all rows back to back (row i is readings[i*12:(i+1)*12]), NaN = missing
+StationTable = namedtuple("StationTable", ["stations", "station_index", "stn_ids", "lats", "lons",
+                                           "sources", "row_source", "row_station", "readings"])
+
+CANCEL_CHECK_ROWS = 10000  # Rows parsed between checks of the cancel flag
+CANCEL_POLL_S = 0.1        # How often the parent checks the cancel flag while workers read
+
+# Progress passed to the progress callback after every parsed file
+Progress = namedtuple("Progress", ["files_done", "files_total", "rows", "bytes_done", "bytes_total"])
+
+class AnalysisCancelled(Exception):
+    # Raised inside the pipeline when the caller's cancel event has been set
+    pass
+
+# === Optional per-stage instrumentation ===
+class PipelineProfile:
+    # Pass one as profile= to run_reports() and friends to record, per stage, wall and
+    # CPU time plus rows and cells handled, and per file the bad-cell count. With
+    # profile=None (the default) none of this code runs.
+
+    def __init__(self):
+        self.stages = {}  # stage name -> totals
+        self.files = {}   # file name -> rows, cells, bad cells
+        self.peak_memory_kb = None
+
+    @contextmanager
+    def stage(self, name, rows=0, cells=0):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu, rows, cells)
+
+    def add(self, name, wall, cpu, rows=0, cells=0):
+        totals = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0, "rows": 0, "cells": 0})
+        totals["wall_s"] += wall
+        totals["cpu_s"] += cpu
+        totals["calls"] += 1
+        totals["rows"] += rows
+        totals["cells"] += cells
+
+    def add_file(self, filename, rows, cells, bad_cells):
+        self.files[filename] = {"rows": rows, "cells": cells, "bad_cells": bad_cells}
+
+    def record_peak_memory(self):
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak_memory_kb = peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+    def as_dict(self):
+        return {"stages": self.stages, "files": self.files, "peak_memory_kb": self.peak_memory_kb}
+
+    def dump_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+def timed(profile, name, rows=0, cells=0):
+    # profile.stage(...) when profiling, otherwise a context manager that does nothing
+    return profile.stage(name, rows, cells) if profile is not None else nullcontext()
+
+# Report files written by run_reports(), in the order they are produced
+REPORT_FILES = ["average_temp.txt", "largest_temp_range_station.txt", "warmest_and_coolest_station.txt"]
+
+# === Running aggregate kept per station and per season ===
+class RunningStats:
+    # Count, sum, min and max of a stream of readings - constant memory per key
+    __slots__ = ("count", "total", "low", "high")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, temps):
+        if temps:
+            self.count += len(temps)
+            self.total = sum(temps, self.total)
+            self.low = min(self.low, min(temps))
+            self.high = max(self.high, max(temps))
+
+    def merge(self, other):
+        if other.count:
+            self.count += other.count
+            self.total += other.total
+            self.low = min(self.low, other.low)
+            self.high = max(self.high, other.high)
+        return self
+
+    def mean(self):
+        return self.total / self.count
+
+    def range(self):
+        return self.high - self.low
+
+# Compact state the three reports are computed from:
+#   stations - station name -> RunningStats over all of its readings
+#   seasons  - season name  -> RunningStats over all readings in that season
+TemperatureStats = namedtuple("TemperatureStats", ["stations", "seasons"])
+
+def new_temperature_stats():
+    return TemperatureStats({}, {season: RunningStats() for season in SEASONS})
+
+# === Helper functions for reading the station CSVs ===
+def new_station_table():
+    return StationTable([], {}, [], array('d'), array('d'), [], array('i'), array('i'), array('d'))
+
+def parse_temperature(cell):
+    try:
+        return float(cell)
+    except (TypeError, ValueError):
+        return MISSING  # If data is missing or wrong, mark it as missing
+
+def present(values):
+    return list(filterfalse(math.isnan, values))
+
+def header_columns(header):
+    # Map the header to column positions once, not once per row (None = column missing)
+    name_col, id_col, lat_col, lon_col = [header.index(column) if column in header else None
+                                          for column in ("STATION_NAME", "STN_ID", "LAT", "LON")]
+    month_cols = [header.index(month) if month in header else None for month in MONTHS]
+    return name_col, (id_col, lat_col, lon_col), month_cols
+
+def iter_file_rows(file_path):
+    # Yield (station, [12 monthly readings], (STN_ID, LAT, LON) text) for every row of one CSV file
+    with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = [column.strip() for column in next(reader, [])]
+        name_col, location_cols, month_cols = header_columns(header)
+        padding = [""] * len(header)
+
+        for row in reader:
+            if not row:
+                continue  # Blank line
+            if len(row) < len(header):
+                row = row + padding[len(row):]
+            station = row[name_col].strip() if name_col is not None else ""
+            yield (station, [parse_temperature(row[col]) if col is not None else MISSING for col in month_cols],
+                   tuple(row[col] if col is not None else "" for col in location_cols))
+
+def profiled_file_rows(file_path, profile):
+    # Same rows as iter_file_rows(), read in separately timed stages (profiling only)
+    wall, cpu = time.perf_counter(), time.process_time()
+    with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = [column.strip() for column in next(reader, [])]
+        raw_rows = [row for row in reader if row]
+    profile.add("csv_decode", time.perf_counter() - wall, time.process_time() - cpu, rows=len(raw_rows))
+    name_col, location_cols, month_cols = header_columns(header)
+    padding = [""] * len(header)
+
+    rows = []
+    bad = []
+    wall, cpu = time.perf_counter(), time.process_time()
+    for row in raw_rows:
+        if len(row) < len(header):
+            row = row + padding[len(row):]
+        temps = []
+        for col in month_cols:
+            try:
+                temps.append(float(row[col]) if col is not None else MISSING)
+            except ValueError:
+                temps.append(MISSING)
+                bad.append(row[col])
+        rows.append((row[name_col].strip() if name_col is not None else "", temps,
+                     tuple(row[col] if col is not None else "" for col in location_cols)))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    # Time the failing float() calls on their own by replaying just the bad cells,
+    # and count that time under "bad_cells" instead of "float_parse"
+    bad_wall, bad_cpu = time.perf_counter(), time.process_time()
+    for cell in bad:
+        parse_temperature(cell)
+    bad_wall, bad_cpu = time.perf_counter() - bad_wall, time.process_time() - bad_cpu
+    cells = len(rows) * len(MONTHS)
+    profile.add("bad_cells", bad_wall, bad_cpu, cells=len(bad))
+    profile.add("float_parse", max(wall - bad_wall, 0.0), max(cpu - bad_cpu, 0.0), len(rows), cells)
+    profile.add_file(os.path.basename(file_path), len(rows), cells, len(bad))
+    return rows
+
+def csv_files(folder_path, profile=None):
+    with timed(profile, "list_directory"):
+        return [os.path.join(folder_path, filename)
+                for filename in sorted(os.listdir(folder_path)) if filename.endswith(".csv")]
+
+def read_station_file(file_path, table, profile=None):
+    source_id = len(table.sources)
+    table.sources.append(os.path.basename(file_path))
+    rows = iter_file_rows(file_path) if profile is None else profiled_file_rows(file_path, profile)
+    with timed(profile, "build_table"):
+        add_table_rows(table, rows, source_id)
+    return table
+
+def add_table_rows(table, rows, source_id):
+    stations, station_index = table.stations, table.station_index
+    for station, temps, (stn_id, lat, lon) in rows:
+        station_id = station_index.get(station)
+        if station_id is None:
+            # Station metadata is taken from the first row seen for the station
+            station_id = station_index[station] = len(stations)
+            stations.append(station)
+            table.stn_ids.append(stn_id.strip())
+            table.lats.append(parse_temperature(lat))
+            table.lons.append(parse_temperature(lon))
+        table.row_source.append(source_id)
+        table.row_station.append(station_id)
+        table.readings.extend(temps)
+
+# === Function to read and organize temperature data ===
+def read_temperature_data(folder_path, use_store=True, profile=None):
+    # A binary store that is up to date with the CSVs is used instead of parsing them
+    if use_store:
+        with timed(profile, "open_store"):
+            table = open_fresh_store(folder_path)
+        if table is not None:
+            return table
+    table = new_station_table()
+    for file_path in csv_files(folder_path, profile):
+        read_station_file(file_path, table, profile)
+    return table
+
+# === Binary station store: parse the CSVs once, memory-map afterwards ===
+def write_column(f, column):
+    column.tofile(f)
+    f.write(b"\0" * (-f.tell() % 8))  # Keep every column 8-byte aligned
+
+def convert_to_store(folder_path, store_path=None):
+    if store_path is None:
+        store_path = os.path.join(folder_path, STORE_FILENAME)
+    table = read_temperature_data(folder_path, use_store=False)
+    metadata = json.dumps({"stations": table.stations, "stn_ids": table.stn_ids,
+                           "sources": table.sources}).encode("utf-8")
+
+    temp_path = store_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION, sys.byteorder == "little",
+                                  len(table.stations), len(table.row_station), len(table.sources), len(metadata)))
+        for column in (table.lats, table.lons, table.row_source, table.row_station, table.readings):
+            write_column(f, column)
+        f.write(metadata)
+    os.replace(temp_path, store_path)
+    return store_path
+
+def open_station_store(store_path):
+    # Columns are memoryviews straight into the mapped file: no parsing, no copies
+    with open(store_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < STORE_HEADER.size:
+        raise ValueError(f"{store_path} is not a station store")
+    magic, version, little_endian, n_stations, n_rows, n_sources, metadata_size = STORE_HEADER.unpack_from(mapped)
+    if magic != STORE_MAGIC or version != STORE_VERSION or little_endian != (sys.byteorder == "little"):
+        raise ValueError(f"{store_path} was written by an incompatible version")
+
+    view = memoryview(mapped)
+    offset = STORE_HEADER.size
+    columns = []
+    for typecode, length in (("d", n_stations), ("d", n_stations), ("i", n_rows), ("i", n_rows), ("d", n_rows * 12)):
+        size = length * struct.calcsize(typecode)
+        columns.append(view[offset:offset + size].cast(typecode))
+        offset += size + (-size % 8)
+    metadata = json.loads(bytes(view[offset:offset + metadata_size]).decode("utf-8"))
+    lats, lons, row_source, row_station, readings = columns
+
+    stations = metadata["stations"]
+    return StationTable(stations, {station: i for i, station in enumerate(stations)}, metadata["stn_ids"],
+                        lats, lons, metadata["sources"], row_source, row_station, readings)
+
+def open_fresh_store(folder_path, store_path=None):
+    # Return the store's table if it is newer than every CSV and covers the same files, else None
+    if store_path is None:
+        store_path = os.path.join(folder_path, STORE_FILENAME)
+    try:
+        store_mtime = os.stat(store_path).st_mtime_ns
+    except OSError:
+        return None
+    files = csv_files(folder_path)
+    if any(os.stat(file_path).st_mtime_ns > store_mtime for file_path in files):
+        return None
+    try:
+        table = open_station_store(store_path)
+    except (OSError, ValueError):
+        return None
+    if table.sources != [os.path.basename(file_path) for file_path in files]:
+        return None  # CSV files were added or removed since the store was written
+    return table
+
+# === Streaming mode: one pass over the rows, no readings kept ===
+def aggregate_rows(rows, stats=None):
+    if stats is None:
+        stats = new_temperature_stats()
+    station_stats, season_stats = stats
+    for station, temps, _ in rows:
+        if station not in station_stats:
+            station_stats[station] = RunningStats()
+        station_stats[station].add(present(temps))
+        for season, columns in SEASON_COLUMNS.items():
+            season_stats[season].add(present([temps[col] for col in columns]))
+    return stats
+
+def check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise AnalysisCancelled()
+
+# Set in every worker process by compute_file_stats, so a cancel also stops the files
+# the workers are reading (a threading.Event cannot cross into them)
+worker_cancel = None
+
+def set_worker_cancel(event):
+    global worker_cancel
+    worker_cancel = event
+
+def file_stats(file_path, cancel=None, profile=None):
+    # Partial aggregate and row count of a single CSV file (runs in a worker process when parallel)
+    if cancel is None:
+        cancel = worker_cancel
+    stats = new_temperature_stats()
+    if profile is not None:
+        check_cancel(cancel)
+        rows = profiled_file_rows(file_path, profile)
+        with profile.stage("aggregate", rows=len(rows)):
+            aggregate_rows(rows, stats)
+        return stats, len(rows)
+    rows = iter_file_rows(file_path)
+    row_count = 0
+    while True:
+        batch = list(islice(rows, CANCEL_CHECK_ROWS))
+        if not batch:
+            return stats, row_count
+        check_cancel(cancel)
+        aggregate_rows(batch, stats)
+        row_count += len(batch)
+
+def merge_stats(partials, stats=None):
+    # Partials must be given in file order, so the result never depends on
+    # which worker finished first and always matches the serial path
+    if stats is None:
+        stats = new_temperature_stats()
+    for partial in partials:
+        for station, station_stats in partial.stations.items():
+            if station not in stats.stations:
+                stats.stations[station] = RunningStats()
+            stats.stations[station].merge(station_stats)
+        for season, season_stats in partial.seasons.items():
+            stats.seasons[season].merge(season_stats)
+    return stats
+
+def compute_file_stats(files, workers=1, progress=None, cancel=None, profile=None):
+    # Yields the partial aggregate of every file, in the same order as files, so callers
+    # can fold each one in as it arrives instead of keeping them all.
+    # progress(Progress) is called after each file; setting cancel stops with AnalysisCancelled.
+    # When profiling, files are read serially so the stage times add up to the run.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(files))
+    if profile is not None:
+        workers = 1
+    sizes = [os.path.getsize(file_path) for file_path in files] if progress else []
+
+    pool = stop = None
+    if workers <= 1:
+        results = (file_stats(file_path, cancel, profile) for file_path in files)
+    else:
+        # The futures are collected in input order whatever the completion order. While
+        # waiting for one, the parent keeps checking cancel; stop then tells the workers.
+        stop = multiprocessing.Event()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=set_worker_cancel, initargs=(stop,))
+        results = wait_results([pool.submit(file_stats, file_path) for file_path in files], cancel)
+
+    files_done = rows_done = bytes_done = 0
+    try:
+        for partial, row_count in results:
+            check_cancel(cancel)
+            files_done += 1
+            if progress is not None:
+                rows_done += row_count
+                bytes_done += sizes[files_done - 1]
+                progress(Progress(files_done, len(files), rows_done, bytes_done, sum(sizes)))
+            yield partial
+    finally:
+        if pool is not None:
+            # Workers stop within CANCEL_CHECK_ROWS rows, so no work is left running
+            # behind a cancelled or failed run
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+def wait_results(futures, cancel=None):
+    # Results of futures in order, checking cancel every CANCEL_POLL_S while waiting
+    for future in futures:
+        while True:
+            try:
+                result = future.result(timeout=CANCEL_POLL_S)
+                break
+            except ResultTimeout:
+                check_cancel(cancel)
+        yield result
+
+def stream_temperature_stats(folder_path, workers=1, progress=None, cancel=None, profile=None):
+    # Each partial is merged as soon as it arrives, so memory depends on the station
+    # count only, however many files there are
+    stats = new_temperature_stats()
+    for partial in compute_file_stats(csv_files(folder_path, profile), workers, progress, cancel, profile):
+        with timed(profile, "merge"):
+            merge_stats([partial], stats)
+    return stats
+
+# === Incremental mode: reuse cached per-file aggregates ===
+def stats_to_json(stats):
+    return {
+        "stations": {station: [s.count, s.total, s.low, s.high] for station, s in stats.stations.items()},
+        "seasons": {season: [s.count, s.total, s.low, s.high] for season, s in stats.seasons.items()},
+    }
+
+def stats_from_json(data):
+    stats = new_temperature_stats()
+    for key, target in (("stations", stats.stations), ("seasons", stats.seasons)):
+        for name, (count, total, low, high) in data[key].items():
+            running = target[name] = RunningStats()
+            running.count, running.total, running.low, running.high = count, total, low, high
+    return stats
+
+def file_fingerprint(file_path):
+    info = os.stat(file_path)
+    return info.st_size, info.st_mtime_ns
+
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_name(filename, size, mtime_ns, content_hash):
+    return f"{filename}.{size}.{mtime_ns}.{content_hash}.json"
+
+def cache_entries(cache_dir):
+    # CSV name -> (entry name, size, mtime_ns, sha256) of the entries found in cache_dir
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return {}
+    entries = {}
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            filename, size, mtime_ns, content_hash = name[:-len(".json")].rsplit(".", 3)
+            entries[filename] = (name, int(size), int(mtime_ns), content_hash)
+        except ValueError:
+            continue  # Not one of ours
+    return entries
+
+def load_entry(entry_path):
+    with open(entry_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CACHE_VERSION:
+        raise ValueError("cache entry written by another version of this program")
+    return stats_from_json(data["stats"])
+
+def save_entry(entry_path, stats):
+    temp_path = entry_path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "stats": stats_to_json(stats)}, f)
+        os.replace(temp_path, entry_path)  # Never leave a half-written entry behind
+    except OSError:
+        pass  # Read-only folder: the analysis still works, just without a cache
+
+def prune_cache(cache_dir, keep):
+    # Entries of deleted or changed files, and temp files of interrupted runs
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        if name not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+def cached_temperature_stats(folder_path, workers=1, cache_dir=None, progress=None, cancel=None, profile=None):
+    # Cached partials are loaded one at a time and fresh ones merged as they arrive, both
+    # in file order, so memory depends on the station count and the result matches the
+    # serial path exactly
+    if cache_dir is None:
+        cache_dir = os.path.join(folder_path, CACHE_DIRNAME)
+    files = csv_files(folder_path, profile)
+
+    # Only files that are new, or whose contents really changed, are parsed again
+    with timed(profile, "cache_check"):
+        names, changed = find_changed_files(files, cache_dir, cache_entries(cache_dir))
+    if changed:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            pass
+
+    stats = new_temperature_stats()
+    fresh = compute_file_stats(changed, workers, progress, cancel, profile)
+    changed = set(changed)
+    try:
+        for file_path, name in zip(files, names):
+            entry_path = os.path.join(cache_dir, name)
+            partial = None
+            if file_path in changed:
+                partial = next(fresh)
+            else:
+                check_cancel(cancel)
+                with timed(profile, "cache_load"):
+                    try:
+                        partial = load_entry(entry_path)
+                    except (OSError, ValueError, KeyError, TypeError):
+                        pass  # Unreadable or outdated entry: parse the file again
+                if partial is None:
+                    partial, _ = file_stats(file_path, cancel, profile)
+                    changed.add(file_path)
+            if file_path in changed:
+                with timed(profile, "cache_save"):
+                    save_entry(entry_path, partial)
+            with timed(profile, "merge"):
+                merge_stats([partial], stats)
+    finally:
+        fresh.close()  # Stops the worker pool when cancelled part-way
+
+    with timed(profile, "cache_save"):
+        prune_cache(cache_dir, set(names))
+    return stats
+
+def find_changed_files(files, cache_dir, cached):
+    # Entry name of every file, and the files that must be parsed again
+    names, changed = [], []
+    for file_path in files:
+        filename = os.path.basename(file_path)
+        size, mtime_ns = file_fingerprint(file_path)
+        entry = cached.get(filename)
+        if entry and entry[1:3] == (size, mtime_ns):
+            names.append(entry[0])
+            continue
+        content_hash = file_hash(file_path)
+        name = cache_name(filename, size, mtime_ns, content_hash)
+        names.append(name)
+        if entry and entry[3] == content_hash:
+            try:
+                # Touched, not changed: the entry only needs its new name
+                os.replace(os.path.join(cache_dir, entry[0]), os.path.join(cache_dir, name))
+                continue
+            except OSError:
+                pass
+        changed.append(file_path)
+    return names, changed
+
+# === Columnar mode: reduce the readings array of a loaded table ===
+def summarize_table(table):
+    stats = new_temperature_stats()
+    station_stats = [RunningStats() for _ in table.stations]
+    readings = table.readings
+    for row, station_id in enumerate(table.row_station):
+        station_stats[station_id].add(present(readings[row * 12:row * 12 + 12]))
+    stats.stations.update(zip(table.stations, station_stats))
+
+    # Each month is a strided column of the readings array
+    for season, columns in SEASON_COLUMNS.items():
+        stats.seasons[season].add([temp for col in columns for temp in present(readings[col::12])])
+    return stats
+
+# === Task 1: Calculate Average Seasonal Temperatures ===
+def average_seasonal_temps(stats):
+    averages = {}
+    for season in ['Summer', 'Autumn', 'Winter', 'Spring']:
+        season_stats = stats.seasons.get(season)
+        if season_stats and season_stats.count:
+            averages[season] = season_stats.mean()
+    return averages
+
+def calculate_average_seasonal_temps(stats, output_file):
+    with open(output_file, "w") as f:
+        f.write("Average Temperatures by Season (1986–2005):\n")
+        for season, avg_temp in average_seasonal_temps(stats).items():
+            f.write(f"{season}: {avg_temp:.2f}°C\n")
+
+# === Task 2: Find Station with Largest Temperature Range ===
+def largest_temp_range(stats):
+    largest_range = 0
+    stations = []
+
+    for station, station_stats in stats.stations.items():
+        if station_stats.count:
+            temp_range = station_stats.range()
+            if temp_range > largest_range:
+                largest_range = temp_range
+                stations = [station]
+            elif temp_range == largest_range:
+                stations.append(station)
+    return largest_range, stations
+
+def calculate_largest_temp_range(stats, output_file):
+    largest_range, stations = largest_temp_range(stats)
+
+    with open(output_file, "w") as f:
+        f.write(f"Largest Temperature Range: {largest_range:.2f}°C\n")
+        f.write("Station(s):\n")
+        for station in stations:
+            f.write(f"{station}\n")
+
+# === Task 3: Find Warmest and Coolest Stations ===
+def extreme_stations(stats):
+    averages = {station: station_stats.mean()
+                for station, station_stats in stats.stations.items() if station_stats.count}
+
+    max_avg = max(averages.values())
+    min_avg = min(averages.values())
+
+    warmest_stations = [station for station, avg in averages.items() if avg == max_avg]
+    coolest_stations = [station for station, avg in averages.items() if avg == min_avg]
+    return max_avg, warmest_stations, min_avg, coolest_stations
+
+def calculate_extreme_stations(stats, output_file):
+    max_avg, warmest_stations, min_avg, coolest_stations = extreme_stations(stats)
+
+    with open(output_file, "w") as f:
+        f.write(f"Warmest Station(s) Avg Temp: {max_avg:.2f}°C\n")
+        for station in warmest_stations:
+            f.write(f"{station}\n")
+        f.write(f"\nCoolest Station(s) Avg Temp: {min_avg:.2f}°C\n")
+        for station in coolest_stations:
+            f.write(f"{station}\n")
+
+# === Run the whole pipeline for one folder ===
+def run_reports(folder_path, output_dir=None, workers=1, use_cache=True, progress=None, cancel=None, profile=None):
+    if output_dir is None:
+        output_dir = folder_path
+    with timed(profile, "open_store"):
+        table = open_fresh_store(folder_path)
+    if table is not None:
+        with timed(profile, "summarize_table", rows=len(table.row_station)):
+            stats = summarize_table(table)
+    elif use_cache:
+        stats = cached_temperature_stats(folder_path, workers=workers, progress=progress, cancel=cancel,
+                                         profile=profile)
+    else:
+        stats = stream_temperature_stats(folder_path, workers=workers, progress=progress, cancel=cancel,
+                                         profile=profile)
+    check_cancel(cancel)
+
+    avg_file, range_file, extremes_file = [os.path.join(output_dir, name) for name in REPORT_FILES]
+    with timed(profile, "calculate_average_seasonal_temps"):
+        calculate_average_seasonal_temps(stats, avg_file)
+    with timed(profile, "calculate_largest_temp_range"):
+        calculate_largest_temp_range(stats, range_file)
+    with timed(profile, "calculate_extreme_stations"):
+        calculate_extreme_stations(stats, extremes_file)
+    if profile is not None:
+        profile.record_peak_memory()
+    return [avg_file, range_file, extremes_file]
+
+# === Command-line entry point (no tkinter needed) ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create the temperature reports for folders of station CSV files.")
+    parser.add_argument("folders", nargs="+", help="folders containing stations_group_*.csv files")
+    parser.add_argument("-o", "--output-dir",
+                        help="where to write the reports (default: each input folder; "
+                             "with several folders, one subfolder per input folder)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="worker processes for reading CSV files (0 = one per CPU core)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the per-folder cache")
+    parser.add_argument("--build-store", action="store_true",
+                        help="convert each folder's CSV files to a memory-mapped binary store first")
+    parser.add_argument("--profile", metavar="JSON",
+                        help="record per-stage timings and bad-cell counts and write them to this file")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or None
+    profiles = {}
+    status = 0
+    for folder_path in args.folders:
+        output_dir = args.output_dir
+        if output_dir and len(args.folders) > 1:
+            output_dir = os.path.join(output_dir, os.path.basename(os.path.normpath(folder_path)))
+        try:
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            if args.build_store:
+                convert_to_store(folder_path)
+            profile = PipelineProfile() if args.profile else None
+            for report in run_reports(folder_path, output_dir, workers=workers, use_cache=not args.no_cache,
+                                      profile=profile):
+                print(report)
+            if profile is not None:
+                profiles[folder_path] = profile.as_dict()
+        except (OSError, ValueError) as e:
+            print(f"{folder_path}: {e}", file=sys.stderr)
+            status = 1
+    if args.profile:
+        with open(args.profile, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import sys
+import math
+import argparse
+from collections import defaultdict
+
+from temperature_analysis import (SEASON_COLUMNS, RunningStats, new_temperature_stats, present,
+                                  read_temperature_data, average_seasonal_temps, largest_temp_range,
+                                  extreme_stations)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+# === Grid index over station LAT/LON ===
+class StationGrid:
+    # Stations bucketed into cell_size x cell_size degree cells, so a query only
+    # looks at the cells it overlaps instead of every station in the network
+
+    def __init__(self, table, cell_size=1.0):
+        self.table = table
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)  # (lat cell, lon cell) -> station ids
+        for station_id, (lat, lon) in enumerate(zip(table.lats, table.lons)):
+            if not (math.isnan(lat) or math.isnan(lon)):
+                self.cells[self.cell_of(lat, lon)].append(station_id)
+
+        # Rows of every station, so regional reports never scan the whole table
+        self.station_rows = [[] for _ in table.stations]
+        for row, station_id in enumerate(table.row_station):
+            self.station_rows[station_id].append(row)
+
+    def cell_of(self, lat, lon):
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def candidates(self, min_lat, min_lon, max_lat, max_lon):
+        # Station ids in every cell overlapping the box (min_lon > max_lon crosses 180°)
+        lat_cells = range(math.floor(min_lat / self.cell_size), math.floor(max_lat / self.cell_size) + 1)
+        if min_lon <= max_lon:
+            lon_spans = [(min_lon, max_lon)]
+        else:
+            lon_spans = [(min_lon, 180.0), (-180.0, max_lon)]
+        lon_cells = set()
+        for low, high in lon_spans:
+            lon_cells.update(range(math.floor(low / self.cell_size), math.floor(high / self.cell_size) + 1))
+
+        if len(lat_cells) * len(lon_cells) > len(self.cells):
+            # Box covers more cells than are occupied: walk the occupied ones instead
+            keys = [key for key in self.cells if key[0] in lat_cells and key[1] in lon_cells]
+        else:
+            keys = [(lat_cell, lon_cell) for lat_cell in lat_cells for lon_cell in lon_cells]
+        return [station_id for key in keys for station_id in self.cells.get(key, ())]
+
+    def in_box(self, min_lat, min_lon, max_lat, max_lon):
+        lats, lons = self.table.lats, self.table.lons
+        if min_lon <= max_lon:
+            inside_lon = lambda lon: min_lon <= lon <= max_lon
+        else:
+            inside_lon = lambda lon: lon >= min_lon or lon <= max_lon
+        return sorted(station_id for station_id in self.candidates(min_lat, min_lon, max_lat, max_lon)
+                      if min_lat <= lats[station_id] <= max_lat and inside_lon(lons[station_id]))
+
+    def within_radius(self, lat, lon, radius_km):
+        # (distance km, station id) for every station within radius_km, nearest first
+        lat_span = radius_km / KM_PER_DEGREE
+        min_lat, max_lat = max(lat - lat_span, -90.0), min(lat + lat_span, 90.0)
+        widest = max(abs(min_lat), abs(max_lat))
+        if widest >= 90.0 or lat_span / math.cos(math.radians(widest)) >= 180.0:
+            min_lon, max_lon = -180.0, 180.0  # Circle reaches a pole or wraps the globe
+        else:
+            lon_span = lat_span / math.cos(math.radians(widest))
+            min_lon = (lon - lon_span + 180.0) % 360.0 - 180.0
+            max_lon = (lon + lon_span + 180.0) % 360.0 - 180.0
+
+        lats, lons = self.table.lats, self.table.lons
+        found = []
+        for station_id in self.candidates(min_lat, min_lon, max_lat, max_lon):
+            distance = haversine_km(lat, lon, lats[station_id], lons[station_id])
+            if distance <= radius_km:
+                found.append((distance, station_id))
+        found.sort()
+        return found
+
+    def nearest(self, lat, lon, k=1):
+        # Grow the search circle until it holds k stations; everything closer is then inside it
+        radius_km = self.cell_size * KM_PER_DEGREE
+        while True:
+            found = self.within_radius(lat, lon, radius_km)
+            if len(found) >= k or radius_km >= math.pi * EARTH_RADIUS_KM:
+                return found[:k]
+            radius_km *= 2
+
+    def region_stats(self, station_ids):
+        # TemperatureStats over just the given stations, from their rows only
+        stats = new_temperature_stats()
+        readings = self.table.readings
+        for station_id in sorted(station_ids):
+            station_stats = stats.stations[self.table.stations[station_id]] = RunningStats()
+            for row in self.station_rows[station_id]:
+                temps = readings[row * 12:row * 12 + 12]
+                station_stats.add(present(temps))
+                for season, columns in SEASON_COLUMNS.items():
+                    stats.seasons[season].add(present([temps[col] for col in columns]))
+        return stats
+
+def load_station_grid(folder_path, cell_size=1.0):
+    return StationGrid(read_temperature_data(folder_path), cell_size)
+
+# === Command-line region queries ===
+def print_region_report(grid, station_ids):
+    stats = grid.region_stats(station_ids)
+    print(f"{len(station_ids)} station(s)")
+    if not any(station_stats.count for station_stats in stats.stations.values()):
+        return
+    for season, avg_temp in average_seasonal_temps(stats).items():
+        print(f"{season}: {avg_temp:.2f}°C")
+    largest_range, stations = largest_temp_range(stats)
+    print(f"Largest Temperature Range: {largest_range:.2f}°C ({', '.join(stations)})")
+    max_avg, warmest, min_avg, coolest = extreme_stations(stats)
+    print(f"Warmest Avg Temp: {max_avg:.2f}°C ({', '.join(warmest)})")
+    print(f"Coolest Avg Temp: {min_avg:.2f}°C ({', '.join(coolest)})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regional and nearest-station temperature queries.")
+    parser.add_argument("folder", help="folder containing stations_group_*.csv files")
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--nearest", nargs=2, type=float, metavar=("LAT", "LON"))
+    query.add_argument("--box", nargs=4, type=float, metavar=("MIN_LAT", "MIN_LON", "MAX_LAT", "MAX_LON"))
+    query.add_argument("--radius", nargs=3, type=float, metavar=("LAT", "LON", "KM"))
+    parser.add_argument("-k", type=int, default=5, help="stations returned by --nearest")
+    parser.add_argument("--cell-size", type=float, default=1.0, help="grid cell size in degrees")
+    args = parser.parse_args(argv)
+
+    grid = load_station_grid(args.folder, args.cell_size)
+    if args.nearest:
+        for distance, station_id in grid.nearest(*args.nearest, k=args.k):
+            print(f"{distance:9.1f} km  {grid.table.stations[station_id]}")
+    elif args.box:
+        print_region_report(grid, grid.in_box(*args.box))
+    else:
+        print_region_report(grid, [station_id for _, station_id in grid.within_radius(*args.radius)])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
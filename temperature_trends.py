@@ -0,0 +1,125 @@
+import re
+import sys
+import math
+import argparse
+from array import array
+
+from temperature_analysis import MONTHS, SEASON_COLUMNS, MISSING, present, read_temperature_data
+
+YEAR_PATTERN = re.compile(r"(\d{4})")
+
+def source_year(filename):
+    # stations_group_2003.csv -> 2003 (None when the file name has no year)
+    match = YEAR_PATTERN.search(filename)
+    return int(match.group(1)) if match else None
+
+# === (station, year, month) index over a loaded table ===
+class YearIndex:
+    # Dense station x year x 12 cube of readings, NaN where there is no data.
+    # A station listed twice in the same year keeps its last row.
+
+    def __init__(self, table, min_months=9):
+        self.table = table
+        self.min_months = min_months  # Months needed before a year's mean is trusted
+        source_years = [source_year(source) for source in table.sources]
+        self.years = sorted({year for year in source_years if year is not None})
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+
+        n_years = len(self.years)
+        self.cube = array('d', [MISSING]) * (len(table.stations) * n_years * 12)
+        readings = table.readings
+        for row, (source_id, station_id) in enumerate(zip(table.row_source, table.row_station)):
+            year = source_years[source_id]
+            if year is not None:
+                start = (station_id * n_years + self.year_index[year]) * 12
+                self.cube[start:start + 12] = array('d', readings[row * 12:row * 12 + 12])
+
+    def offset(self, station_id, year_pos):
+        return (station_id * len(self.years) + year_pos) * 12
+
+    def get(self, station, year, month):
+        # Single reading, e.g. get("MARBLE-BAR", 2003, "January"); NaN when missing
+        station_id = self.table.station_index[station]
+        return self.cube[self.offset(station_id, self.year_index[year]) + MONTHS.index(month)]
+
+    def station_year(self, station_id, year_pos):
+        start = self.offset(station_id, year_pos)
+        return self.cube[start:start + 12]
+
+    # === Batch queries over all stations ===
+    def yearly_seasonal_averages(self):
+        # {year: {season: average over every station}}
+        averages = {}
+        for year_pos, year in enumerate(self.years):
+            averages[year] = {}
+            for season, columns in SEASON_COLUMNS.items():
+                temps = [temp for station_id in range(len(self.table.stations))
+                         for temp in present(self.station_year(station_id, year_pos)[col] for col in columns)]
+                if temps:
+                    averages[year][season] = sum(temps) / len(temps)
+        return averages
+
+    def annual_means(self):
+        # One list per station with the mean of every year (NaN when too few months)
+        means = []
+        for station_id in range(len(self.table.stations)):
+            station_means = []
+            for year_pos in range(len(self.years)):
+                temps = present(self.station_year(station_id, year_pos))
+                station_means.append(sum(temps) / len(temps) if len(temps) >= self.min_months else MISSING)
+            means.append(station_means)
+        return means
+
+    def station_trends(self):
+        # Least-squares slope (°C per year) of every station's annual means, NaN below two years
+        trends = []
+        for station_means in self.annual_means():
+            points = [(year, mean) for year, mean in zip(self.years, station_means) if not math.isnan(mean)]
+            if len(points) < 2:
+                trends.append(MISSING)
+                continue
+            mean_year = sum(year for year, _ in points) / len(points)
+            mean_temp = sum(temp for _, temp in points) / len(points)
+            spread = sum((year - mean_year) ** 2 for year, _ in points)
+            trends.append(sum((year - mean_year) * (temp - mean_temp) for year, temp in points) / spread)
+        return trends
+
+    def anomalies(self):
+        # Every station's annual mean minus its own mean over all its years
+        anomalies = []
+        for station_means in self.annual_means():
+            known = present(station_means)
+            baseline = sum(known) / len(known) if known else MISSING
+            anomalies.append([mean - baseline for mean in station_means])
+        return anomalies
+
+    def fastest_warming(self, count=10):
+        # [(trend, station)] for the stations that warmed fastest, steepest first
+        ranked = [(trend, station) for trend, station in zip(self.station_trends(), self.table.stations)
+                  if not math.isnan(trend)]
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return ranked[:count]
+
+def load_year_index(folder_path, min_months=9):
+    return YearIndex(read_temperature_data(folder_path), min_months)
+
+# === Command-line trend report ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-year seasonal averages and station warming trends.")
+    parser.add_argument("folder", help="folder containing stations_group_YEAR.csv files")
+    parser.add_argument("--top", type=int, default=10, help="number of fastest-warming stations to list")
+    parser.add_argument("--min-months", type=int, default=9, help="months needed for a year to count")
+    args = parser.parse_args(argv)
+
+    index = load_year_index(args.folder, args.min_months)
+    print("Average Temperatures by Season and Year:")
+    for year, averages in index.yearly_seasonal_averages().items():
+        print(f"{year}: " + "  ".join(f"{season} {avg:.2f}°C" for season, avg in averages.items()))
+
+    print("\nFastest Warming Station(s):")
+    for trend, station in index.fastest_warming(args.top):
+        print(f"{trend:+.3f}°C/year  {station}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
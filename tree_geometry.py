@@ -0,0 +1,123 @@
+import math
+from array import array
+from operator import add
+from collections import namedtuple
+
+# Same look as Recursive_tree.py: the stem is a thick brown line, every branch a
+# green one as wide as the levels still to come below it
+PALETTE = ("saddlebrown", "forestgreen")
+STEM_COLOR, BRANCH_COLOR = range(len(PALETTE))
+STEM_WIDTH = 12
+
+# Turtle's window: the stem starts 50 pixels above the bottom edge, pointing up
+DEFAULT_WIDTH = 800
+DEFAULT_HEIGHT = 800
+BOTTOM_MARGIN = 50
+
+# One entry per branch, in the order turtle draws them; coordinates are turtle's
+# (origin at the centre of the window, y pointing up)
+TreeSegments = namedtuple("TreeSegments", ["x0", "y0", "x1", "y1", "widths", "colors", "depths"])
+TreeParams = namedtuple("TreeParams", ["left_angle", "right_angle", "start_length", "max_depth", "reduction_factor"])
+
+def start_point(height=DEFAULT_HEIGHT):
+    return 0.0, float(-height // 2 + BOTTOM_MARGIN)
+
+def new_segments():
+    return TreeSegments(array('d'), array('d'), array('d'), array('d'), array('B'), array('B'), array('H'))
+
+def generate_tree(params, start=None, heading=90.0):
+    # Every branch of the tree draw_tree would draw, without recursion or a turtle.
+    # The explicit stack pops a branch, then its left subtree, then its right one,
+    # which is the same pre-order turtle walks in.
+    left_angle, right_angle, start_length, max_depth, reduction_factor = params
+    x, y = start if start is not None else start_point()
+    segments = new_segments()
+    x0, y0, x1, y1, widths, colors, depths = segments
+
+    stack = [(x, y, heading, float(start_length), max_depth)] if max_depth > 0 else []
+    while stack:
+        x, y, heading, length, depth = stack.pop()
+        radians = math.radians(heading)
+        end_x = x + length * math.cos(radians)
+        end_y = y + length * math.sin(radians)
+        x0.append(x)
+        y0.append(y)
+        x1.append(end_x)
+        y1.append(end_y)
+        is_stem = depth == max_depth
+        widths.append(STEM_WIDTH if is_stem else max(depth, 1))
+        colors.append(STEM_COLOR if is_stem else BRANCH_COLOR)
+        depths.append(depth)
+        if depth > 1:
+            length *= reduction_factor
+            stack.append((end_x, end_y, heading - right_angle, length, depth - 1))
+            stack.append((end_x, end_y, heading + left_angle, length, depth - 1))
+    return segments
+
+# === Level-by-level generation for deep trees ===
+# Every branch of one level has the same length, and its heading only depends on how
+# many of its ancestors turned left, so a whole level is computed from the previous
+# level's tips with level + 1 direction vectors and C-level map()/slice operations.
+# A level shares one colour and width, so it is drawn as one stroke.
+TreeLevel = namedtuple("TreeLevel", ["color", "width", "x0", "y0", "x1", "y1", "depth", "length"])
+
+MIN_LENGTH = 0.5  # Branches shorter than this many pixels (and everything below them) are not generated
+MERGE_GRID = 1.0  # Tips in the same pixel cell with the same heading grow the same subtree; only one is expanded
+
+def interleave(typecode, left, right):
+    # [left[0], right[0], left[1], right[1], ...]
+    both = array(typecode, bytes(array(typecode).itemsize * 2 * len(left)))
+    both[0::2] = left
+    both[1::2] = right
+    return both
+
+def iter_levels(params, start=None, heading=90.0, min_length=MIN_LENGTH, merge_grid=MERGE_GRID):
+    # Yields one TreeLevel at a time, stem first; only the current tips are kept in memory.
+    # min_length=0 and merge_grid=0 generate every branch of generate_tree.
+    left_angle, right_angle, start_length, max_depth, reduction_factor = params
+    x, y = start if start is not None else start_point()
+    tips_x, tips_y, tips_turns = array('d', [x]), array('d', [y]), array('H', [0])  # turns: left turns so far
+    length = float(start_length)
+
+    for level in range(max_depth):
+        if level and abs(length) < min_length:
+            return
+        # Heading of a branch with t left turns among its `level` ancestors
+        directions = [math.radians(heading + t * left_angle - (level - t) * right_angle) for t in range(level + 1)]
+        step_x = [length * math.cos(radians) for radians in directions]
+        step_y = [length * math.sin(radians) for radians in directions]
+
+        if level == 0:
+            x0, y0, turns = tips_x, tips_y, tips_turns
+            x1, y1 = array('d', [x + step_x[0]]), array('d', [y + step_y[0]])
+        else:
+            # Every tip grows a left child (one more left turn), then a right one
+            left_turns = array('H', map((1).__add__, tips_turns))
+            x0 = interleave('d', tips_x, tips_x)
+            y0 = interleave('d', tips_y, tips_y)
+            x1 = interleave('d', array('d', map(add, tips_x, map(step_x.__getitem__, left_turns))),
+                            array('d', map(add, tips_x, map(step_x.__getitem__, tips_turns))))
+            y1 = interleave('d', array('d', map(add, tips_y, map(step_y.__getitem__, left_turns))),
+                            array('d', map(add, tips_y, map(step_y.__getitem__, tips_turns))))
+            turns = interleave('H', left_turns, tips_turns)
+
+        depth = max_depth - level
+        if level == 0:
+            yield TreeLevel(STEM_COLOR, STEM_WIDTH, x0, y0, x1, y1, depth, length)
+        else:
+            yield TreeLevel(BRANCH_COLOR, max(depth, 1), x0, y0, x1, y1, depth, length)
+
+        tips_x, tips_y, tips_turns = x1, y1, turns
+        if merge_grid > 0:
+            tips_x, tips_y, tips_turns = merge_tips(tips_x, tips_y, tips_turns, merge_grid)
+        length *= reduction_factor
+
+def merge_tips(tips_x, tips_y, tips_turns, grid):
+    # One tip per (grid cell, heading); the others would only redraw its subtree
+    scale = 1 / grid
+    cells = zip(map(round, map(scale.__mul__, tips_x)), map(round, map(scale.__mul__, tips_y)), tips_turns)
+    keep = list(dict(zip(cells, range(len(tips_x)))).values())
+    if len(keep) == len(tips_x):
+        return tips_x, tips_y, tips_turns
+    return (array('d', map(tips_x.__getitem__, keep)), array('d', map(tips_y.__getitem__, keep)),
+            array('H', map(tips_turns.__getitem__, keep)))
@@ -0,0 +1,222 @@
+import os
+import sys
+import math
+import zlib
+import time
+import struct
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from tree_geometry import (PALETTE, STEM_COLOR, BRANCH_COLOR, STEM_WIDTH, DEFAULT_WIDTH, DEFAULT_HEIGHT, MIN_LENGTH,
+                           MERGE_GRID, TreeParams, iter_levels, start_point)
+
+# Tk colour names used by the tree, as RGB
+RGB = {"white": (255, 255, 255), "saddlebrown": (139, 69, 19), "forestgreen": (34, 139, 34)}
+
+# The writers draw strokes: (color, width, x0, y0, x1, y1, ...) groups of segments that
+# share a colour and width, such as the TreeLevels of iter_levels, which they consume
+# one at a time so a deep tree is never held in memory whole.
+
+# === SVG ===
+def write_svg(strokes, output_path, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, background="white"):
+    # One <path> per stroke; turtle coordinates become SVG ones (y down)
+    cx, cy = width / 2, height / 2
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'viewBox="0 0 {width} {height}">\n')
+        f.write(f'<rect width="100%" height="100%" fill="{background}"/>\n')
+        for color, stroke_width, x0, y0, x1, y1, *_ in strokes:
+            f.write('<path d="')
+            f.writelines(f"M{cx + ax:.2f} {cy - ay:.2f}L{cx + bx:.2f} {cy - by:.2f} "
+                         for ax, ay, bx, by in zip(x0, y0, x1, y1))
+            f.write(f'" stroke="{PALETTE[color]}" stroke-width="{stroke_width}" stroke-linecap="round" fill="none"/>\n')
+        f.write("</svg>\n")
+
+# --- Instanced SVG ---
+# Every branch of one level has the same length, colour and width, and the subtree it
+# carries is the same shape wherever it grows, up to a rotation. So each level is
+# defined once, as a <g> drawing its branch along +x plus two rotated <use> copies of
+# the next level, and the file grows with max_depth instead of 2 ** max_depth.
+# Rotations keep stroke widths, so no level needs scaling. Merging tips does not apply.
+def instanced_levels(params, min_length=MIN_LENGTH):
+    # (color, width, length) of every level iter_levels would draw
+    left_angle, right_angle, start_length, max_depth, reduction_factor = params
+    length = float(start_length)
+    for level in range(max_depth):
+        if level and abs(length) < min_length:
+            return
+        depth = max_depth - level
+        yield (STEM_COLOR, STEM_WIDTH, length) if level == 0 else (BRANCH_COLOR, max(depth, 1), length)
+        length *= reduction_factor
+
+def write_instanced_svg(params, output_path, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, min_length=MIN_LENGTH,
+                        heading=90.0, background="white"):
+    # Returns the number of segments the picture stands for
+    left_angle, right_angle = params.left_angle, params.right_angle
+    levels = list(instanced_levels(params, min_length))
+    x, y = start_point(height)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                f'width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n')
+        f.write(f'<rect width="100%" height="100%" fill="{background}"/>\n')
+        if levels:
+            f.write("<defs>\n")
+            for level, (color, stroke_width, length) in enumerate(levels):
+                # SVG's y points down, so turtle's left turn is a negative rotation
+                f.write(f'<g id="level{level}"><path d="M0 0H{length:.3f}" stroke="{PALETTE[color]}" '
+                        f'stroke-width="{stroke_width}" stroke-linecap="round" fill="none"/>')
+                if level + 1 < len(levels):
+                    f.writelines(f'<use xlink:href="#level{level + 1}" transform="translate({length:.3f} 0) '
+                                 f'rotate({turn:g})"/>' for turn in (-left_angle, right_angle))
+                f.write("</g>\n")
+            f.write("</defs>\n")
+            f.write(f'<use xlink:href="#level0" transform="translate({width / 2 + x:.2f} {height / 2 - y:.2f}) '
+                    f'rotate({-heading:g})"/>\n')
+        f.write("</svg>\n")
+    return 2 ** len(levels) - 1
+
+# === PNG ===
+def span(ax, ay, bx, by, radius, row_y):
+    # [low, high] x range of row_y inside the capsule of radius around segment a-b, or None.
+    # The capsule is convex, so this is the hull of the ranges of its two end discs and its body.
+    low, high = math.inf, -math.inf
+    for px, py in ((ax, ay), (bx, by)):
+        dy = row_y - py
+        if abs(dy) <= radius:
+            half = math.sqrt(radius * radius - dy * dy)
+            low, high = min(low, px - half), max(high, px + half)
+
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq > 0:
+        # Body: 0 <= (p - a).d <= |d|^2 and |(p - a) x d| <= radius * |d|, both linear in x
+        body_low, body_high = -math.inf, math.inf
+        for slope, offset, bound_low, bound_high in (
+                (dx, (row_y - ay) * dy - ax * dx, 0.0, length_sq),
+                (dy, -(row_y - ay) * dx - ax * dy, -radius * math.sqrt(length_sq), radius * math.sqrt(length_sq))):
+            if slope == 0:
+                if not bound_low <= offset <= bound_high:
+                    body_low, body_high = math.inf, -math.inf
+            else:
+                first, second = (bound_low - offset) / slope, (bound_high - offset) / slope
+                body_low, body_high = max(body_low, min(first, second)), min(body_high, max(first, second))
+        if body_low <= body_high:
+            low, high = min(low, body_low), max(high, body_high)
+    return (low, high) if low <= high else None
+
+def rasterize(strokes, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, background="white"):
+    # RGB rows (bytearray, 3 bytes per pixel) with every segment filled as a round-capped line
+    pixels = bytearray(bytes(RGB[background]) * (width * height))
+    cx, cy = width / 2, height / 2
+    for color, stroke_width, x0, y0, x1, y1, *_ in strokes:
+        rgb = bytes(RGB[PALETTE[color]])
+        radius = stroke_width / 2
+        for ax, ay, bx, by in zip(x0, y0, x1, y1):
+            ax, ay, bx, by = cx + ax, cy - ay, cx + bx, cy - by
+            if max(ax, bx) + radius < 0 or min(ax, bx) - radius > width:
+                continue  # Off the canvas
+            first_row = max(0, math.floor(min(ay, by) - radius))
+            last_row = min(height - 1, math.ceil(max(ay, by) + radius))
+            for row in range(first_row, last_row + 1):
+                found = span(ax, ay, bx, by, radius, row + 0.5)
+                if found is None:
+                    continue
+                # Pixels whose centre lies inside the span
+                start = max(0, math.ceil(found[0] - 0.5))
+                stop = min(width, math.floor(found[1] - 0.5) + 1)
+                if start < stop:
+                    offset = row * width * 3
+                    pixels[offset + start * 3:offset + stop * 3] = rgb * (stop - start)
+    return pixels
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def write_png(strokes, output_path, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, background="white"):
+    pixels = rasterize(strokes, width, height, background)
+    stride = width * 3
+    raw = b"".join(b"\x00" + pixels[row * stride:(row + 1) * stride] for row in range(height))  # Filter 0 rows
+    with open(output_path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(png_chunk(b"IDAT", zlib.compress(raw, 6)))
+        f.write(png_chunk(b"IEND", b""))
+
+WRITERS = {"svg": write_svg, "png": write_png}
+
+def counted(strokes, counter):
+    # Pass strokes through, adding up their segments in counter[0]
+    for stroke in strokes:
+        counter[0] += len(stroke.x0)
+        yield stroke
+
+def render_tree(params, output_path, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, min_length=MIN_LENGTH,
+                merge_grid=MERGE_GRID, instanced=False):
+    # Generate and write one tree level by level; the format comes from the file extension.
+    # Returns the number of segments drawn.
+    fmt = os.path.splitext(output_path)[1].lstrip(".").lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"unsupported format {fmt!r} (use .svg or .png)")
+    if instanced:
+        if fmt != "svg":
+            raise ValueError("instanced output is only available as .svg")
+        return write_instanced_svg(params, output_path, width, height, min_length)
+    counter = [0]
+    levels = iter_levels(params, start_point(height), min_length=min_length, merge_grid=merge_grid)
+    WRITERS[fmt](counted(levels, counter), output_path, width, height)
+    return counter[0]
+
+# === Parameter sweeps ===
+def sweep_filename(params, fmt):
+    left_angle, right_angle, start_length, max_depth, reduction_factor = params
+    return f"tree_l{left_angle:g}_r{right_angle:g}_s{start_length:g}_d{max_depth}_f{reduction_factor:g}.{fmt}"
+
+def render_sweep(param_sets, output_dir, fmt="png", width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, workers=None,
+                 min_length=MIN_LENGTH, merge_grid=MERGE_GRID, instanced=False):
+    # Render every TreeParams to output_dir across a process pool; returns the segments drawn
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, sweep_filename(params, fmt)) for params in param_sets]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(render_tree, param_sets, paths, itertools.repeat(width), itertools.repeat(height),
+                            itertools.repeat(min_length), itertools.repeat(merge_grid), itertools.repeat(instanced)))
+
+# === Command-line renderer ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render recursive trees to SVG or PNG without a window. "
+                                                 "Give several values to any parameter to sweep over all of them.")
+    parser.add_argument("--left", type=float, nargs="+", default=[20.0], help="left branch angle(s)")
+    parser.add_argument("--right", type=float, nargs="+", default=[25.0], help="right branch angle(s)")
+    parser.add_argument("--length", type=float, nargs="+", default=[100.0], help="starting branch length(s)")
+    parser.add_argument("--depth", type=int, nargs="+", default=[5], help="recursion depth(s)")
+    parser.add_argument("--reduction", type=float, nargs="+", default=[0.7], help="reduction factor(s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[DEFAULT_WIDTH, DEFAULT_HEIGHT], metavar=("W", "H"))
+    parser.add_argument("-o", "--output", default="tree.png", help="output file, or folder for a sweep")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="png", help="file format of a sweep")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes for a sweep")
+    parser.add_argument("--min-length", type=float, default=MIN_LENGTH,
+                        help="skip branches shorter than this many pixels (0 draws every level)")
+    parser.add_argument("--merge-grid", type=float, default=MERGE_GRID,
+                        help="expand one of the tips sharing a cell of this size and a heading (0 expands all)")
+    parser.add_argument("--instanced", action="store_true",
+                        help="SVG only: define each level once and reuse it, so the file grows linearly with depth")
+    args = parser.parse_args(argv)
+
+    param_sets = [TreeParams(*values) for values in
+                  itertools.product(args.left, args.right, args.length, args.depth, args.reduction)]
+    width, height = args.size
+    if args.instanced and (args.format if len(param_sets) > 1 else os.path.splitext(args.output)[1].lower()[1:]) != "svg":
+        parser.error("--instanced writes SVG only")
+    start = time.perf_counter()
+    if len(param_sets) == 1:
+        count = render_tree(param_sets[0], args.output, width, height, args.min_length, args.merge_grid,
+                            args.instanced)
+        print(f"{count:,} segments -> {args.output} in {time.perf_counter() - start:.2f}s")
+    else:
+        count = render_sweep(param_sets, args.output, args.format, width, height, args.workers,
+                             args.min_length, args.merge_grid, args.instanced)
+        print(f"{len(param_sets)} trees ({count:,} segments) -> {args.output} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())